@@ -1,6 +1,6 @@
 {
     'name': 'Real Estate Management',
-    'version': '1.1',
+    'version': '1.2',
     'license': 'LGPL-3',
     'category': 'Website',
     'summary': 'Module for managing real estate properties and website integration',
@@ -16,11 +16,18 @@
         'data/sequences.xml',
         'data/agent_registration_demo.xml',
         'data/mail_activity.xml',
+        'data/ir_cron.xml',
         # 'data/dashboard_data.xml',
 
         # Views
         'views/property_views.xml',
         'views/property_category_views.xml',
+        'views/property_geocode_cache_views.xml',
+        'views/property_geocode_backfill_views.xml',
+        'views/property_ai_cache_views.xml',
+        'views/property_ai_generation_run_views.xml',
+        'views/llm_response_cache_views.xml',
+        'views/llm_metric_views.xml',
         'views/dashboard_menu.xml',
         'views/menu.xml',
         'views/property_registration_views.xml',
@@ -1,4 +1,3 @@
 from . import property_controller
 from . import agent_portal
 # from . import ai_content
-
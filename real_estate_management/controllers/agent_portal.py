@@ -393,7 +393,7 @@ class AgentPortalController(http.Controller):
         prop_regs = PropReg.search([])
         agent_regs = AgentReg.search([])
         categories = Category.search([])
-        city_list = sorted(list(set([p.city for p in all_properties if p.city])))
+        city_list = Property._get_city_list(published_only=False)
 
         # Compute stats, JSON for charts, etc.
         values = {
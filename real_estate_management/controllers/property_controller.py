@@ -2,15 +2,108 @@ from odoo import http, fields
 from odoo.http import request
 import json
 from odoo.tools.json import scriptsafe as json_scriptsafe
+from odoo.tools.lru import LRU
 import base64
+import hashlib
+import time
+from werkzeug.http import http_date
 from odoo.exceptions import UserError
+from odoo.addons.real_estate_management.models.property import MAP_CLUSTER_MAX_ZOOM
+from odoo.addons.real_estate_management.models.property_ai_cache import TRENDING_NEWS_KEY
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# (width, height) served by the property image routes, sized for map popups
+# and listing cards so we never ship full-size uploads to the browser.
+PROPERTY_IMAGE_SIZES = {
+    'popup': (320, 180),
+    'card': (480, 320),
+    'gallery': (1024, 768),
+}
+
+# Columns fetched for each page; binary and AI HTML fields are never read
+MAP_MARKER_FIELDS = ['latitude', 'longitude', 'price', 'category_id']
+MAP_CARD_FIELDS = [
+    'name', 'street', 'city', 'zip_code', 'price', 'plot_area', 'contact_phone',
+    'category_id', 'write_date',
+]
+FEATURED_CARD_FIELDS = ['name', 'city', 'price', 'plot_area', 'category_id', 'write_date']
+LISTING_CARD_FIELDS = [
+    'name', 'category_id', 'price', 'plot_area', 'price_per_sqft', 'city', 'zip_code',
+    'status', 'write_date',
+]
+
+# Paging of the viewport marker endpoint
+MAP_MARKER_PAGE_SIZE = 200
+MAP_MARKER_MAX_PAGE_SIZE = 500
+
+# Rendered public pages, per worker, keyed by route and normalized query.
+# Entries are dropped when Property._get_public_cache_token() changes and
+# at the latest after PUBLIC_PAGE_CACHE_TTL seconds, which bounds how long
+# AI-generated sections can stay stale.
+PUBLIC_PAGE_CACHE_TTL = 600
+_public_page_cache = LRU(256)
+
+# The CSRF token is per session, so it is swapped for this marker before a
+# page is stored and put back for each visitor when the page is served.
+CSRF_TOKEN_PLACEHOLDER = '__real_estate_csrf_token__'
+
+# Session keys website_sale sets once a visitor has a cart or picked a
+# pricelist: the layout (cart badge, prices) then differs per session, so
+# those visitors get freshly rendered pages.
+PUBLIC_PAGE_SESSION_KEYS = ('sale_order_id', 'website_sale_cart_quantity', 'website_sale_current_pl')
+
+# News ticker payloads, per worker, keyed by database and city. Within
+# NEWS_CACHE_TTL seconds conditional requests are answered with a 304 from
+# here alone; browsers and proxies may reuse a response for NEWS_MAX_AGE
+# seconds and keep serving it while they revalidate in the background.
+NEWS_CACHE_TTL = 60
+NEWS_MAX_AGE = 300
+NEWS_STALE_WHILE_REVALIDATE = 3600
+_news_cache = LRU(512)
+
 
 class RealEstateController(http.Controller):
 
+    # ─────────────────────────────────────────────────────────────
+    # PROPERTY IMAGES
+    # Stable, cacheable image URLs used by the map markers, featured
+    # block and listing cards instead of inlined base64 data.
+    # ─────────────────────────────────────────────────────────────
+    @http.route('/property/<int:property_id>/image/<string:size>',
+                type='http', auth='public', website=True, sitemap=False)
+    def property_image(self, property_id, size, unique=None, **kwargs):
+        if size not in PROPERTY_IMAGE_SIZES:
+            return request.not_found()
+        prop = request.env['property.property'].sudo().browse(property_id)
+        if not prop.exists() or not prop.is_published:
+            return request.not_found()
+        record, field_name = prop._get_cover_image_source()
+        return self._property_image_response(record, field_name, size, unique)
+
+    @http.route('/property/<int:property_id>/gallery/<int:attachment_id>/<string:size>',
+                type='http', auth='public', website=True, sitemap=False)
+    def property_gallery_image(self, property_id, attachment_id, size, unique=None, **kwargs):
+        if size not in PROPERTY_IMAGE_SIZES:
+            return request.not_found()
+        prop = request.env['property.property'].sudo().browse(property_id)
+        if not prop.exists() or not prop.is_published or attachment_id not in prop.gallery_image_ids.ids:
+            return request.not_found()
+        attachment = request.env['ir.attachment'].sudo().browse(attachment_id)
+        return self._property_image_response(attachment, 'raw', size, unique)
+
+    def _property_image_response(self, record, field_name, size, unique):
+        width, height = PROPERTY_IMAGE_SIZES[size]
+        stream = request.env['ir.binary']._get_image_stream_from(
+            record, field_name, width=width, height=height, crop=True,
+            placeholder='web/static/img/placeholder.png',
+        )
+        return stream.get_response(
+            max_age=http.STATIC_CACHE_LONG if unique else http.STATIC_CACHE,
+            immutable=bool(unique),
+        )
+
     # ─────────────────────────────────────────────────────────────
     # NEW ENDPOINT  ← THIS IS THE KEY ADDITION
     # Called by property_map.js via fetch('/api/investment-news?city=...')
@@ -19,114 +112,342 @@ class RealEstateController(http.Controller):
     @http.route('/api/investment-news', type='http', auth='public', website=True, methods=['GET'], csrf=False)
     def api_investment_news(self, **kwargs):
         city = kwargs.get('city', '').strip()
-        Property = request.env['property.property'].sudo()
-
-        news = ''
+        if request.env['property.ai.cache'].sudo()._is_caching_disabled():
+            if not self._is_news_city(city):
+                return request.not_found()
+            body, _pending = self._get_investment_news_body(city)
+            return request.make_response(body, headers=[
+                ('Content-Type', 'application/json'),
+                ('Cache-Control', 'no-cache, no-store'),
+            ])
+
+        key = (request.env.cr.dbname, city)
+        entry = _news_cache.get(key)
+        now = time.time()
+        if not entry or entry['expires'] < now:
+            # Only checked on a miss: a cached key already is a listed city
+            if not self._is_news_city(city):
+                return request.not_found()
+            body, pending = self._get_investment_news_body(city)
+            entry = {
+                'body': body,
+                'pending': pending,
+                'expires': now + NEWS_CACHE_TTL,
+            }
+            entry['etag'] = hashlib.sha1(entry['body'].encode()).hexdigest()
+            _news_cache[key] = entry
+
+        headers = [
+            ('ETag', '"%s"' % entry['etag']),
+            # Fallback text is about to be replaced, do not let it be reused
+            ('Cache-Control', 'no-cache' if entry['pending'] else
+             'public, max-age=%d, stale-while-revalidate=%d' % (NEWS_MAX_AGE, NEWS_STALE_WHILE_REVALIDATE)),
+        ]
+        if_none_match = request.httprequest.if_none_match
+        if if_none_match and if_none_match.contains(entry['etag']):
+            return request.make_response('', headers=headers, status=304)
+        return request.make_response(entry['body'], headers=headers + [('Content-Type', 'application/json')])
+
+    def _is_news_city(self, city):
+        """News is generated and cached per city: only for cities we list"""
+        return not city or city in request.env['property.property'].sudo()._get_city_list()
+
+    def _get_investment_news_body(self, city):
+        """JSON payload of the news ticker and whether it is still the fallback text.
+
+        ``pending`` tells the ticker to stream the real news from
+        /api/ai-stream/news.
+        """
+        Cache = request.env['property.ai.cache'].sudo()
+        news, pending = '', False
         try:
             if city:
-                news = Property.get_daily_investment_news(city)
+                news, pending = Cache._lookup('daily_news', city)
                 _logger.info(f'[API] City news for "{city}": {len(news)} chars')
             else:
-                news = Property.get_trending_investment_news()
+                news, pending = Cache._lookup('trending_news', TRENDING_NEWS_KEY)
                 _logger.info(f'[API] Trending news: {len(news)} chars')
         except Exception as e:
             _logger.error(f'[API] News fetch error: {e}')
             news = ''
+        return json.dumps({'city': city, 'news': news, 'pending': pending}), pending
 
-        result = json.dumps({'city': city, 'news': news})
-        return request.make_response(
-            result,
-            headers=[
-                ('Content-Type', 'application/json'),
-                ('Cache-Control', 'no-cache, no-store'),
-            ]
+    # ─────────────────────────────────────────────────────────────
+    # AI CONTENT STREAMING
+    # Server-sent events relaying the LLM answer while it is being
+    # generated, used by the ticker and city panels while they still
+    # show the fallback text. The final text is stored in the AI cache.
+    # ─────────────────────────────────────────────────────────────
+    @http.route('/api/ai-stream/<string:kind>', type='http', auth='public', website=True,
+                methods=['GET'], csrf=False, sitemap=False)
+    def api_ai_stream(self, kind, **kwargs):
+        city = kwargs.get('city', '').strip()
+        # Live generation is limited to cities we list, not any string
+        if city and city not in request.env['property.property'].sudo()._get_city_list():
+            return request.not_found()
+        if kind == 'news':
+            cache_type, key = ('daily_news', city) if city else ('trending_news', TRENDING_NEWS_KEY)
+        elif kind == 'investment-info' and city:
+            cache_type, key = 'investment_info', city
+        else:
+            return request.not_found()
+
+        events = request.env['property.ai.cache'].sudo()._stream(cache_type, key)
+
+        def generate():
+            for event, data in events:
+                if event == 'done' and cache_type == 'investment_info':
+                    data = json.loads(data)
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+        return request.make_response(generate(), headers=[
+            ('Content-Type', 'text/event-stream'),
+            ('Cache-Control', 'no-cache'),
+            ('X-Accel-Buffering', 'no'),
+        ])
+
+    # ─────────────────────────────────────────────────────────────
+    # LLM METRICS EXPORT
+    # Per caller latency, token and outcome summary for monitoring;
+    # restricted by the access rights on property.llm.metric.
+    # ─────────────────────────────────────────────────────────────
+    @http.route('/real_estate/llm_metrics.json', type='http', auth='user', methods=['GET'], sitemap=False)
+    def llm_metrics_json(self, date_from=None, date_to=None, **kwargs):
+        report = request.env['property.llm.metric']._get_report(
+            date_from=fields.Date.to_date(date_from), date_to=fields.Date.to_date(date_to))
+        return request.make_json_response(report, headers=[('Cache-Control', 'no-store')])
+
+    # ─────────────────────────────────────────────────────────────
+    # PUBLIC PAGE CACHE
+    # Anonymous visitors asking for the same page and filters get the
+    # same HTML, so it is rendered once and revalidated with ETag /
+    # Last-Modified until a property or category changes.
+    # ─────────────────────────────────────────────────────────────
+    def _is_public_page_cacheable(self):
+        return (
+            request.httprequest.method == 'GET'
+            and request.env.user._is_public()
+            and not request.session.uid
+            and not any(request.session.get(key) for key in PUBLIC_PAGE_SESSION_KEYS)
+            and not request.session.debug
+            and not request.env['property.ai.cache'].sudo()._is_caching_disabled()
         )
 
+    def _render_public_page(self, template, params, prepare_values):
+        """Render ``template`` with ``prepare_values(**params)``, through the page cache"""
+        if not self._is_public_page_cacheable():
+            return request.render(template, prepare_values(**params))
+
+        # Read the token before rendering, so that a change committed while
+        # we render makes this entry stale instead of hiding the change.
+        token = request.env['property.property'].sudo()._get_public_cache_token()
+        key = (
+            request.env.cr.dbname, request.website.id, request.env.lang,
+            # The default pricelist of anonymous visitors follows their country
+            request.geoip.country_code,
+            request.httprequest.path, tuple(sorted(params.items())),
+        )
+        entry = _public_page_cache.get(key)
+        now = time.time()
+        if not entry or entry['token'] != token or entry['expires'] < now:
+            html = str(request.render(template, prepare_values(**params), lazy=False))
+            html = html.replace(request.csrf_token(), CSRF_TOKEN_PLACEHOLDER)
+            entry = {
+                'token': token,
+                'expires': now + PUBLIC_PAGE_CACHE_TTL,
+                'last_modified': int(now),
+                'etag': hashlib.sha1(html.encode()).hexdigest(),
+                'html': html,
+            }
+            _public_page_cache[key] = entry
+
+        headers = [
+            ('ETag', 'W/"%s"' % entry['etag']),
+            ('Last-Modified', http_date(entry['last_modified'])),
+            ('Cache-Control', 'private, no-cache'),
+        ]
+        httprequest = request.httprequest
+        if httprequest.if_none_match:
+            not_modified = httprequest.if_none_match.contains_weak(entry['etag'])
+        else:
+            modified_since = httprequest.if_modified_since
+            not_modified = bool(modified_since) and modified_since.timestamp() >= entry['last_modified']
+        if not_modified:
+            return request.make_response('', headers=headers, status=304)
+
+        html = entry['html'].replace(CSRF_TOKEN_PLACEHOLDER, request.csrf_token())
+        return request.make_response(html, headers=headers + [('Content-Type', 'text/html; charset=utf-8')])
+
     # ─────────────────────────────────────────────────────────────
-    # MAIN MAP PAGE  (unchanged)
+    # MAIN MAP PAGE
+    # Markers are not embedded here: property_map.js pulls them for
+    # the visible viewport from /property/map/markers.
     # ─────────────────────────────────────────────────────────────
     @http.route('/', type='http', auth='public', website=True)
     def property_map(self, **kwargs):
+        selected_city = kwargs.get('city', '').strip()
+        # City insights are generated per city: an unlisted city is shown,
+        # and cached, as no city at all
+        if selected_city not in request.env['property.property'].sudo()._get_city_list():
+            selected_city = ''
+        return self._render_public_page(
+            'real_estate_management.property_map_template',
+            {'selected_city': selected_city},
+            self._prepare_property_map_values,
+        )
 
+    def _prepare_property_map_values(self, selected_city):
         Property = request.env['property.property'].sudo()
-        selected_city = kwargs.get('city', '')
-        all_properties = Property.search([('is_published', '=', True)])
-        city_list = sorted(list(set([p.city for p in all_properties if p.city])))
-
-        search_domain = [
-            ('is_published', '=', True),
-            ('latitude', '!=', False),
-            ('longitude', '!=', False)
-        ]
-        if selected_city:
-            search_domain.append(('city', '=', selected_city))
+        city_list = Property._get_city_list()
 
-        properties = Property.search(search_domain)
+        map_domain = Property._get_map_domain(city=selected_city)
 
         featured_domain = [('is_published', '=', True), ('is_featured', '=', True)]
         if selected_city:
             featured_domain.append(('city', '=', selected_city))
-        featured_properties = Property.search(featured_domain)
+        featured_properties = [{
+            'id': values['id'],
+            'name': values['name'],
+            'city': values['city'],
+            'price': values['price'],
+            'plot_area': values['plot_area'],
+            'category': values['category_id'] and values['category_id'][1],
+            'image_url': Property._build_image_url(values['id'], values['write_date'], 'card'),
+        } for values in Property.search_read(featured_domain, FEATURED_CARD_FIELDS)]
 
         city_investment_info = None
-        if selected_city:
+        if selected_city in city_list:
             city_investment_info = Property.get_city_investment_info(selected_city)
 
-        palette = ["#059669", "#dc2626", "#7c3aed", "#ea580c", "#2563eb", "#d97706", "#0891b2", "#9333ea"]
         category_colors = {}
-        idx = 0
-
-        property_data = []
-        for prop in properties:
-            if prop.latitude and prop.longitude:
-                cat = prop.category_id.name if prop.category_id else 'Property'
-                if cat not in category_colors:
-                    category_colors[cat] = palette[idx % len(palette)]
-                    idx += 1
-
-                image_url = None
-                if prop.image:
-                    image_url = f"data:image/png;base64,{prop.image.decode('utf-8')}"
-                elif prop.gallery_image_ids:
-                    first_image = prop.gallery_image_ids[0]
-                    if first_image.datas:
-                        image_url = f"data:image/png;base64,{first_image.datas.decode('utf-8')}"
-
-                full_address = ", ".join(filter(None, [prop.street, prop.city, prop.zip_code]))
-
-                property_data.append({
-                    'id': prop.id,
-                    'name': prop.name or '',
-                    'latitude': float(prop.latitude),
-                    'longitude': float(prop.longitude),
-                    'street': prop.street or '',
-                    'city': prop.city or '',
-                    'zip_code': prop.zip_code or '',
-                    'price': float(prop.price) if prop.price else 0,
-                    'contact_phone': prop.contact_phone or '',
-                    'contact_email': prop.contact_email or '',
-                    'contact_name': prop.contact_name or '',
-                    'short_description': prop.short_description or '',
-                    'image_url': image_url,
-                    'property_type': cat,
-                    'nearby_landmarks': prop.nearby_landmarks or '',
-                    'views': prop.views or 0,
-                    'seo_title': prop.seo_title or '',
-                    'marker_color': category_colors[cat],
-                    'full_address': full_address,
-                })
+        for [category] in Property._read_group(map_domain, ['category_id']):
+            category_colors[category.name or 'Property'] = Property._get_map_marker_color(category)
+
+        map_bounds = Property._get_map_bounds(map_domain)
 
-        _logger.info(f"🎯 RENDER - City: '{selected_city}', Properties: {len(property_data)}")
+        _logger.info(f"🎯 RENDER - City: '{selected_city}', Categories: {len(category_colors)}")
 
-        return request.render('real_estate_management.property_map_template', {
-            'property_count': len(property_data),
-            'properties_json': json_scriptsafe.dumps(property_data) if property_data else '[]',
+        return {
+            'map_bounds': json_scriptsafe.dumps(map_bounds),
             'category_colors': json_scriptsafe.dumps(category_colors),
             'city_list': city_list,
             'selected_city': selected_city,
             'featured_properties': featured_properties,
             'city_investment_info': city_investment_info,
-        })
+        }
+
+    # ─────────────────────────────────────────────────────────────
+    # MAP MARKERS
+    # Called by property_map.js on every `moveend` with the visible
+    # bounding box (Leaflet's "west,south,east,north") and pages
+    # through the markers inside it. Below MAP_CLUSTER_MAX_ZOOM it
+    # returns one cluster per grid cell instead of the markers.
+    #
+    # The payload is columnar: parallel arrays indexed by marker,
+    # with `cat` pointing into a per-response `categories` table.
+    # Popup details come from /property/<id>/card on hover.
+    # ─────────────────────────────────────────────────────────────
+    @http.route('/property/map/markers', type='http', auth='public', website=True,
+                methods=['GET'], sitemap=False)
+    def property_map_markers(self, bbox='', zoom=None, city='', category_id=None,
+                             offset=0, limit=MAP_MARKER_PAGE_SIZE, **kwargs):
+        try:
+            west, south, east, north = [float(value) for value in bbox.split(',')]
+            zoom = int(zoom) if zoom else None
+            category_id = int(category_id) if category_id else None
+            offset = max(int(offset), 0)
+            limit = min(max(int(limit), 1), MAP_MARKER_MAX_PAGE_SIZE)
+        except ValueError:
+            return request.make_json_response({'error': 'Invalid map parameters'}, status=400)
+
+        Property = request.env['property.property'].sudo()
+        # Clusters are cached per zoom and filter: only accept values the
+        # map can actually send, so clients cannot fill the cache with junk.
+        if (zoom is not None and zoom < 0) \
+                or (city and city not in Property._get_city_list()) \
+                or (category_id and not request.env['property.category'].sudo().browse(category_id).exists()):
+            return request.make_json_response({'error': 'Invalid map parameters'}, status=400)
+
+        if zoom is not None and zoom < MAP_CLUSTER_MAX_ZOOM:
+            clusters = Property._get_map_clusters(
+                zoom, west, south, east, north, city=city, category_id=category_id)
+            result = {
+                'zoom': zoom,
+                'clustered': True,
+                'next_offset': None,
+                'lat': [round(cluster['latitude'], 5) for cluster in clusters],
+                'lng': [round(cluster['longitude'], 5) for cluster in clusters],
+                'count': [cluster['count'] for cluster in clusters],
+                'price_min': [round(cluster['price_min']) for cluster in clusters],
+                'price_max': [round(cluster['price_max']) for cluster in clusters],
+                'price_avg': [round(cluster['price_avg']) for cluster in clusters],
+            }
+            return request.make_json_response(result, headers=[('Cache-Control', 'public, max-age=60')])
+
+        # Fetch one extra row to know whether another page exists
+        properties = Property._search_bbox(
+            west, south, east, north,
+            domain=Property._get_map_domain(city=city, category_id=category_id),
+            offset=offset, limit=limit + 1, order='id',
+        )
+        has_more = len(properties) > limit
+
+        # One query for the columns, one for the category names
+        rows = properties[:limit].read(MAP_MARKER_FIELDS)
+
+        categories = []
+        category_index = {}
+        result = {
+            'zoom': zoom,
+            'clustered': False,
+            'next_offset': offset + limit if has_more else None,
+            'categories': categories,
+            'ids': [],
+            'lat': [],
+            'lng': [],
+            'price': [],
+            'cat': [],
+        }
+        for values in rows:
+            category_key = values['category_id'] and values['category_id'][0]
+            if category_key not in category_index:
+                category = Property.category_id.browse(category_key)
+                category_index[category_key] = len(categories)
+                categories.append({
+                    'name': values['category_id'][1] if category else 'Property',
+                    'color': Property._get_map_marker_color(category),
+                })
+            result['ids'].append(values['id'])
+            result['lat'].append(round(values['latitude'], 5))
+            result['lng'].append(round(values['longitude'], 5))
+            result['price'].append(round(values['price'] or 0))
+            result['cat'].append(category_index[category_key])
+        return request.make_json_response(result, headers=[('Cache-Control', 'public, max-age=60')])
+
+    # ─────────────────────────────────────────────────────────────
+    # MAP HOVER CARD
+    # Details shown in a marker popup, fetched when it first opens.
+    # ─────────────────────────────────────────────────────────────
+    @http.route('/property/<int:property_id>/card', type='http', auth='public', website=True,
+                methods=['GET'], sitemap=False)
+    def property_card(self, property_id, **kwargs):
+        Property = request.env['property.property'].sudo()
+        rows = Property.search_read(
+            [('id', '=', property_id), ('is_published', '=', True)], MAP_CARD_FIELDS, limit=1)
+        if not rows:
+            return request.not_found()
+        values = rows[0]
+        result = {
+            'id': values['id'],
+            'name': values['name'] or '',
+            'property_type': values['category_id'][1] if values['category_id'] else 'Property',
+            'full_address': ", ".join(filter(None, [values['street'], values['city'], values['zip_code']])),
+            'price': float(values['price']) if values['price'] else 0,
+            'plot_area': values['plot_area'] or 0,
+            'contact_phone': values['contact_phone'] or '',
+            'image_url': Property._build_image_url(values['id'], values['write_date'], 'popup'),
+        }
+        return request.make_json_response(result, headers=[('Cache-Control', 'public, max-age=300')])
 
     # ─────────────────────────────────────────────────────────────
     # PROPERTY DETAIL
@@ -136,17 +457,16 @@ class RealEstateController(http.Controller):
         prop = request.env['property.property'].sudo().browse(property_id)
         if not prop.exists() or not prop.is_published:
             return request.not_found()
-        if not prop.ai_content_generated:
-            try:
-                prop.generate_ai_content()
-            except Exception as e:
-                _logger.error(f"Failed to generate AI content for property {prop.id}: {e}")
-        try:
-            prop.write({'views': prop.views + 1})
-        except Exception as e:
-            _logger.error(f"Failed to update views for property {prop.id}: {e}")
+        # Counted by the view flush cron; no write on the property row here
+        request.env['property.view.hit'].sudo()._log_hit(prop.id)
+        # AI content is generated by the queue; until then the page shows
+        # placeholders. With caching disabled (benchmarks), generate it here
+        # as the page did before the queue existed.
+        if prop._is_ai_content_pending() and request.env['property.ai.cache'].sudo()._is_caching_disabled():
+            prop.generate_ai_content()
         return request.render('real_estate_management.property_detail_page', {
             'property': prop,
+            'ai_pending': prop._is_ai_content_pending(),
         })
 
     # ─────────────────────────────────────────────────────────────
@@ -154,10 +474,17 @@ class RealEstateController(http.Controller):
     # ─────────────────────────────────────────────────────────────
     @http.route('/properties', type='http', auth='public', website=True)
     def property_listing(self, **kwargs):
-        search = kwargs.get('search', '')
-        city = kwargs.get('city', '')
-        zip_code = kwargs.get('zip_code', '')
+        return self._render_public_page(
+            'real_estate_management.property_listing_template',
+            {
+                'search': kwargs.get('search', '').strip(),
+                'city': kwargs.get('city', '').strip(),
+                'zip_code': kwargs.get('zip_code', '').strip(),
+            },
+            self._prepare_property_listing_values,
+        )
 
+    def _prepare_property_listing_values(self, search, city, zip_code):
         domain = [('is_published', '=', True), ('status', '!=', 'sold')]
         if search:
             domain += ['|', '|',
@@ -169,30 +496,32 @@ class RealEstateController(http.Controller):
         if zip_code:
             domain.append(('zip_code', 'ilike', zip_code))
 
-        properties = request.env['property.property'].sudo().search(domain)
+        Property = request.env['property.property'].sudo()
 
         property_card_data = []
-        for prop in properties:
+        # bin_size: only tell whether there is a cover, without loading it
+        fields_to_read = LISTING_CARD_FIELDS + ['image', 'gallery_image_ids']
+        for values in Property.with_context(bin_size=True).search_read(domain, fields_to_read):
+            has_image = values['image'] or values['gallery_image_ids']
             property_card_data.append({
-                'id': prop.id,
-                'name': prop.name,
-                'image_url': f"data:image/png;base64,{prop.image.decode('utf-8')}" if prop.image else '',
-                'category': prop.category_id.name or '',
-                'price': prop.price,
-                'plot_area': prop.plot_area,
-                'price_per_sqft': prop.price_per_sqft,
-                'city': prop.city,
-                'zip_code': prop.zip_code,
-                'status': prop.status,
-                'status_ribbon_html': prop.status_ribbon_html,
+                'id': values['id'],
+                'name': values['name'],
+                'image_url': has_image and Property._build_image_url(values['id'], values['write_date'], 'card'),
+                'category': values['category_id'] and values['category_id'][1] or '',
+                'price': values['price'],
+                'plot_area': values['plot_area'],
+                'price_per_sqft': values['price_per_sqft'],
+                'city': values['city'],
+                'zip_code': values['zip_code'],
+                'status': values['status'],
             })
 
-        return request.render('real_estate_management.property_listing_template', {
+        return {
             'properties': property_card_data,
             'search': search,
             'city': city,
             'zip_code': zip_code,
-        })
+        }
 
     # ─────────────────────────────────────────────────────────────
     # PROPERTY REGISTRATION
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import logging
+
+_logger = logging.getLogger(__name__)
+
+RETIRED_COLUMNS = [
+    'city_investment_reasons',
+    'city_growth_potential',
+    'city_infrastructure',
+    'city_market_trends',
+    'city_investment_generated',
+    'city_investment_date',
+    'last_city_processed',
+]
+
+
+def migrate(cr, version):
+    """Move city investment info from property rows into property.ai.cache"""
+    cr.execute("""
+        SELECT 1 FROM information_schema.columns
+         WHERE table_name = 'property_property' AND column_name = 'last_city_processed'
+    """)
+    if not cr.fetchone():
+        return
+
+    # Imported entries are already expired, so they are served until the
+    # first visit regenerates them.
+    cr.execute("""
+        INSERT INTO property_ai_cache (city, cache_type, content, is_fallback, refresh_requested,
+                                       expires_at, create_date, write_date)
+        SELECT DISTINCT ON (last_city_processed)
+               last_city_processed, 'investment_info',
+               json_build_object(
+                   'city', last_city_processed,
+                   'ai_investment_reasons', COALESCE(city_investment_reasons, ''),
+                   'ai_growth_potential', COALESCE(city_growth_potential, ''),
+                   'ai_infrastructure', COALESCE(city_infrastructure, ''),
+                   'ai_market_trends', COALESCE(city_market_trends, ''),
+                   'ai_content_generated', TRUE
+               )::text,
+               FALSE, FALSE, now() at time zone 'UTC',
+               COALESCE(city_investment_date, now() at time zone 'UTC'),
+               COALESCE(city_investment_date, now() at time zone 'UTC')
+          FROM property_property
+         WHERE city_investment_generated AND last_city_processed IS NOT NULL
+         ORDER BY last_city_processed, city_investment_date DESC NULLS LAST
+        ON CONFLICT (city, cache_type) DO NOTHING
+    """)
+    _logger.info(f"Moved investment info of {cr.rowcount} cities to property.ai.cache")
+
+    for column in RETIRED_COLUMNS:
+        cr.execute(f'ALTER TABLE property_property DROP COLUMN IF EXISTS "{column}"')
@@ -1,3 +1,6 @@
+from . import llm_client
+from . import llm_response_cache
+from . import llm_metric
 from . import property
 from . import property_category
 from . import property_registration
@@ -5,4 +8,9 @@ from . import agent
 from . import agent_registration
 from . import property_gallery
 from . import dashboard_models
-# from . import property_ai_cache
\ No newline at end of file
+from . import property_geocode_cache
+from . import property_geocode_backfill
+from . import base_geocoder
+from . import property_ai_cache
+from . import property_ai_generation_run
+from . import property_view_hit
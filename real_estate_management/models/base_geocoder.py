@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import requests
+
+from odoo import models, api
+
+_logger = logging.getLogger(__name__)
+
+
+class BaseGeocoder(models.AbstractModel):
+    _inherit = 'base.geocoder'
+
+    @api.model
+    def _call_openstreetmap(self, addr, **kw):
+        """Query a Nominatim-compatible server set in ``real_estate.geocoder_url``.
+
+        This lets imports and backfills run against a self-hosted Nominatim
+        or a local stand-in instead of the public OpenStreetMap service.
+        """
+        url = self.env['ir.config_parameter'].sudo().get_param('real_estate.geocoder_url')
+        if not url:
+            return super(BaseGeocoder, self)._call_openstreetmap(addr, **kw)
+        if not addr:
+            _logger.info('invalid address given')
+            return None
+        try:
+            headers = {'User-Agent': 'Odoo (http://www.odoo.com/contactus)'}
+            response = requests.get(url, headers=headers, params={'format': 'json', 'q': addr}, timeout=5)
+        except Exception as e:
+            self._raise_query_error(e)
+        # Raised as a UserError, which geo_find lets through: the queue then
+        # retries the address instead of caching "not found"
+        if response.status_code != 200:
+            _logger.warning(f"Request to geocoder {url} failed. Code: {response.status_code}")
+            self._raise_query_error(f"HTTP {response.status_code}")
+        try:
+            result = response.json()
+        except ValueError as e:
+            self._raise_query_error(e)
+        if not result:
+            return None
+        geo = result[0]
+        return float(geo['lat']), float(geo['lon'])
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from odoo import models, api
+
+from .llm_metric import record_llm_call
+
+_logger = logging.getLogger(__name__)
+
+# Defaults, overridable with the real_estate.llm_* config params
+LLM_BASE_URL = 'https://api.groq.com/openai/v1'
+LLM_MODEL = 'llama-3.3-70b-versatile'
+LLM_CONNECT_TIMEOUT = 5
+LLM_READ_TIMEOUT = 30
+LLM_MAX_RETRIES = 2
+LLM_BACKOFF_BASE = 0.5
+LLM_BACKOFF_MAX = 8.0
+# The circuit opens after this many consecutive failed calls and lets a
+# single trial call through once LLM_BREAKER_COOLDOWN seconds have passed.
+LLM_BREAKER_THRESHOLD = 5
+LLM_BREAKER_COOLDOWN = 60
+
+LLM_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """The LLM provider could not produce a usable answer"""
+
+
+class LLMUnavailable(LLMError):
+    """The circuit breaker is open: the provider is considered down"""
+
+
+class CircuitBreaker:
+    """Process-wide circuit breaker shared by all threads of a worker"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    def allow(self, cooldown):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < cooldown or self.trial_running:
+                return False
+            # Half-open: let one call probe the provider
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_ignored(self):
+        """An answer that says nothing about the provider's health (e.g. 401)"""
+        with self.lock:
+            self.trial_running = False
+
+    def record_failure(self, threshold):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.failures >= threshold:
+                if self.opened_at is None:
+                    _logger.warning(f"🔌 LLM circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+
+
+# Keep-alive connection pool and breaker shared by every call of the process
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_breaker = CircuitBreaker()
+
+
+def is_provider_failure(status_code):
+    """Whether an answer with ``status_code`` (0: no answer) counts toward the breaker.
+
+    Only overload, server errors, timeouts and connection errors do: a
+    400/401/403 is a problem with the request or its key, which opening
+    the circuit would only hide.
+    """
+    return not status_code or status_code in LLM_RETRY_STATUSES or status_code >= 500
+
+
+def get_backoff(attempt, response=None):
+    """Full-jitter exponential backoff, honouring Retry-After when given"""
+    retry_after = response is not None and response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+
+
+def chat_completion(settings, api_key, messages, max_tokens=800, temperature=0.3, on_rate_limited=None,
+                    caller=None, **params):
+    """Send a chat completion request and return the answer text.
+
+    Does not use the caller's transaction, so it can run in worker
+    threads given the ``settings`` and ``api_key`` read beforehand.
+    Retries 429 and 5xx answers as well as network errors with jittered
+    backoff, calling ``on_rate_limited`` on every 429. Raises
+    LLMUnavailable without calling the provider while the circuit
+    breaker is open, LLMError otherwise. The outcome is added to the
+    property.llm.metric of ``caller``.
+    """
+    if not api_key:
+        record_llm_call(settings.get('dbname'), caller, 'error')
+        raise LLMError("LLM API key is not configured")
+    if not _breaker.allow(settings['breaker_cooldown']):
+        record_llm_call(settings.get('dbname'), caller, 'circuit_open')
+        raise LLMUnavailable("LLM provider unavailable, circuit open")
+
+    payload = dict(params, model=settings['model'], messages=messages,
+                   max_tokens=max_tokens, temperature=temperature)
+    headers = {'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'}
+    url = f"{settings['base_url']}/chat/completions"
+
+    started = time.monotonic()
+    error = None
+    outcome, status_code = 'error', 0
+    for attempt in range(settings['max_retries'] + 1):
+        response = None
+        try:
+            response = _session.post(url, headers=headers, json=payload, timeout=settings['timeout'])
+            outcome, status_code = 'error', response.status_code
+            if response.status_code == 200:
+                body = response.json()
+                text = body['choices'][0]['message']['content'].strip()
+                _breaker.record_success()
+                record_llm_call(settings.get('dbname'), caller, 'success', 200,
+                                time.monotonic() - started, body.get('usage'))
+                return text
+            error = LLMError(f"LLM API error {response.status_code}: {response.text[:200]}")
+            if response.status_code == 429 and on_rate_limited:
+                on_rate_limited()
+            if response.status_code not in LLM_RETRY_STATUSES:
+                break
+        except requests.exceptions.Timeout as e:
+            outcome, status_code = 'timeout', 0
+            error = LLMError(f"LLM request timed out: {e}")
+        except (ValueError, KeyError, IndexError) as e:
+            # Malformed answer body: the provider did answer
+            outcome = 'error'
+            error = LLMError(f"LLM request failed: {e}")
+        except requests.exceptions.RequestException as e:
+            outcome, status_code = 'error', 0
+            error = LLMError(f"LLM request failed: {e}")
+        if attempt < settings['max_retries']:
+            delay = get_backoff(attempt, response)
+            _logger.info(f"🔁 {error}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    if is_provider_failure(status_code):
+        _breaker.record_failure(settings['breaker_threshold'])
+    else:
+        _breaker.record_ignored()
+    record_llm_call(settings.get('dbname'), caller, outcome, status_code, time.monotonic() - started)
+    raise error
+
+
+def chat_completion_stream(settings, api_key, messages, max_tokens=800, temperature=0.3, caller=None, **params):
+    """Send a streaming chat completion request and yield the answer as it arrives.
+
+    Same contract as ``chat_completion`` (caller's transaction unused,
+    breaker checked and updated, metrics recorded), but answer fragments
+    are yielded as the provider sends them as server-sent events. Only
+    the request itself is retried; once tokens have been yielded a
+    failure raises LLMError.
+    """
+    dbname = settings.get('dbname')
+    if not api_key:
+        record_llm_call(dbname, caller, 'error')
+        raise LLMError("LLM API key is not configured")
+    if not _breaker.allow(settings['breaker_cooldown']):
+        record_llm_call(dbname, caller, 'circuit_open')
+        raise LLMUnavailable("LLM provider unavailable, circuit open")
+
+    payload = dict(params, model=settings['model'], messages=messages,
+                   max_tokens=max_tokens, temperature=temperature, stream=True)
+    headers = {'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json',
+               'Accept': 'text/event-stream'}
+    url = f"{settings['base_url']}/chat/completions"
+
+    started = time.monotonic()
+    response = error = None
+    outcome = 'error'
+    for attempt in range(settings['max_retries'] + 1):
+        try:
+            response = _session.post(url, headers=headers, json=payload, timeout=settings['timeout'], stream=True)
+            outcome = 'error'
+            if response.status_code == 200:
+                break
+            error = LLMError(f"LLM API error {response.status_code}: {response.text[:200]}")
+            if response.status_code not in LLM_RETRY_STATUSES:
+                break
+        except requests.exceptions.Timeout as e:
+            outcome = 'timeout'
+            error = LLMError(f"LLM request timed out: {e}")
+        except requests.exceptions.RequestException as e:
+            outcome = 'error'
+            error = LLMError(f"LLM request failed: {e}")
+        if attempt < settings['max_retries']:
+            delay = get_backoff(attempt, response)
+            _logger.info(f"🔁 {error}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+    if response is None or response.status_code != 200:
+        if response is None or is_provider_failure(response.status_code):
+            _breaker.record_failure(settings['breaker_threshold'])
+        else:
+            _breaker.record_ignored()
+        record_llm_call(dbname, caller, outcome, response.status_code if response is not None else 0,
+                        time.monotonic() - started)
+        raise error
+
+    usage = None
+    outcome = 'error'
+    try:
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                chunk = json.loads(data)
+                # Usage comes with the last chunk, under x_groq on Groq
+                usage = chunk.get('usage') or (chunk.get('x_groq') or {}).get('usage') or usage
+                delta = (chunk.get('choices') or [{}])[0].get('delta') or {}
+                if delta.get('content'):
+                    yield delta['content']
+        outcome = 'success'
+    except GeneratorExit:
+        # The consumer stopped reading (the visitor left): the provider was
+        # answering, so count it as a success, which also ends a half-open trial.
+        outcome = 'success'
+        raise
+    except (requests.exceptions.RequestException, ValueError, KeyError, IndexError) as e:
+        outcome = 'timeout' if isinstance(e, requests.exceptions.Timeout) else 'error'
+        raise LLMError(f"LLM stream interrupted: {e}")
+    finally:
+        # Always settle the breaker, whatever ended the stream
+        if outcome == 'success':
+            _breaker.record_success()
+        else:
+            _breaker.record_failure(settings['breaker_threshold'])
+        record_llm_call(dbname, caller, outcome, 200, time.monotonic() - started, usage)
+
+
+def parse_json_answer(response_text):
+    """Parse an LLM answer as JSON, tolerating Markdown code fences"""
+    if response_text.startswith('```'):
+        lines = response_text.split('\n')
+        response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
+        response_text = response_text.replace('```json', '').replace('```', '').strip()
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError as e:
+        raise LLMError(f"JSON parse error: {e}\nResponse: {response_text}")
+
+
+class AdaptiveConcurrencyLimiter:
+    """Bound the number of concurrent LLM calls across threads.
+
+    The bound is halved whenever the provider answers 429 and grows back
+    by one after each streak of successful calls, up to ``limit``.
+    """
+
+    def __init__(self, limit):
+        self.max_limit = self.limit = max(limit, 1)
+        self.active = 0
+        self.successes = 0
+        self.rate_limited = 0
+        self.condition = threading.Condition()
+
+    def __enter__(self):
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self.condition:
+            self.active -= 1
+            if exc_type is None:
+                self.successes += 1
+                if self.successes >= self.limit and self.limit < self.max_limit:
+                    self.limit += 1
+                    self.successes = 0
+            self.condition.notify_all()
+
+    def back_off(self):
+        with self.condition:
+            self.rate_limited += 1
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+
+
+class PropertyLLMClient(models.AbstractModel):
+    _name = 'property.llm.client'
+    _description = 'LLM Client'
+
+    @api.model
+    def _get_settings(self):
+        ICP = self.env['ir.config_parameter'].sudo()
+        return {
+            'base_url': ICP.get_param('real_estate.llm_base_url', LLM_BASE_URL).rstrip('/'),
+            'model': ICP.get_param('real_estate.llm_model', LLM_MODEL),
+            'timeout': (float(ICP.get_param('real_estate.llm_connect_timeout', LLM_CONNECT_TIMEOUT)),
+                        float(ICP.get_param('real_estate.llm_read_timeout', LLM_READ_TIMEOUT))),
+            'max_retries': int(ICP.get_param('real_estate.llm_max_retries', LLM_MAX_RETRIES)),
+            'breaker_threshold': int(ICP.get_param('real_estate.llm_breaker_threshold', LLM_BREAKER_THRESHOLD)),
+            'breaker_cooldown': float(ICP.get_param('real_estate.llm_breaker_cooldown', LLM_BREAKER_COOLDOWN)),
+            # Metrics are written to this database from any thread
+            'dbname': self.env.cr.dbname,
+        }
+
+    @api.model
+    def _get_api_key(self, api_key_param='groq.api_key'):
+        return self.env['ir.config_parameter'].sudo().get_param(api_key_param)
+
+    @api.model
+    def _get_cache_fingerprint(self, settings, messages, max_tokens=800, temperature=0.3, **params):
+        """Response cache key of a ``chat_completion`` call"""
+        params = dict(params, max_tokens=max_tokens, temperature=temperature)
+        params.pop('on_rate_limited', None)
+        params.pop('caller', None)
+        return self.env['property.llm.response.cache']._get_fingerprint(settings['model'], messages, params)
+
+    @api.model
+    def _chat(self, messages, api_key_param='groq.api_key', use_cache=False, parse=None, **kwargs):
+        """Send a chat completion request and return the answer, see ``chat_completion``.
+
+        With ``use_cache``, an identical earlier request (same model,
+        messages and sampling parameters) is answered from
+        property.llm.response.cache instead. ``parse``, when given, turns
+        the answer text into the returned value and may raise LLMError;
+        only answers it accepts are cached.
+        """
+        parse = parse or (lambda answer: answer)
+        settings = self._get_settings()
+        if use_cache and self.env['property.ai.cache'].sudo()._is_caching_disabled():
+            use_cache = False
+        if not use_cache:
+            return parse(chat_completion(settings, self._get_api_key(api_key_param), messages, **kwargs))
+
+        ResponseCache = self.env['property.llm.response.cache'].sudo()
+        fingerprint = self._get_cache_fingerprint(settings, messages, **kwargs)
+        started = time.monotonic()
+        answer = ResponseCache._lookup(fingerprint)
+        self.env['property.llm.metric']._record(kwargs.get('caller'), 'cache_miss' if answer is None else 'cache_hit',
+                                                latency=time.monotonic() - started)
+        if answer is not None:
+            return parse(answer)
+        answer = chat_completion(settings, self._get_api_key(api_key_param), messages, **kwargs)
+        result = parse(answer)
+        ResponseCache._store(fingerprint, settings['model'], messages, answer)
+        return result
+
+    @api.model
+    def _chat_stream(self, messages, api_key_param='groq.api_key', **kwargs):
+        """Return an iterator over the answer fragments, see ``chat_completion_stream``.
+
+        Settings and API key are read right away, so the iterator may be
+        consumed after the current transaction has ended.
+        """
+        return chat_completion_stream(self._get_settings(), self._get_api_key(api_key_param), messages, **kwargs)
+
+    @api.model
+    def _chat_json(self, messages, **kwargs):
+        """Like ``_chat`` but parse the answer as JSON"""
+        return self._chat(messages, parse=parse_json_answer, **kwargs)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.modules.registry import Registry
+
+_logger = logging.getLogger(__name__)
+
+# Default, overridable with the real_estate.llm_metrics_retention_days config param
+LLM_METRICS_RETENTION_DAYS = 90
+
+LLM_CALLERS = [
+    ('property_ai', 'Property AI Content'),
+    ('city_info', 'City Investment Info'),
+    ('city_news', 'City News Ticker'),
+    ('trending_news', 'Trending News Ticker'),
+    ('other', 'Other'),
+]
+
+# Upper bounds (ms) of the latency histogram buckets; slower calls are
+# counted in latency_over_30000.
+LLM_LATENCY_BUCKETS = [250, 500, 1000, 2500, 5000, 10000, 30000]
+LLM_LATENCY_BUCKET_FIELDS = [f'latency_le_{bound}' for bound in LLM_LATENCY_BUCKETS] + ['latency_over_30000']
+
+
+def get_latency_bucket(latency_ms):
+    """Name of the histogram column counting a call of ``latency_ms``"""
+    for bound, field_name in zip(LLM_LATENCY_BUCKETS, LLM_LATENCY_BUCKET_FIELDS):
+        if latency_ms <= bound:
+            return field_name
+    return LLM_LATENCY_BUCKET_FIELDS[-1]
+
+
+def record_llm_call(dbname, caller, outcome, status_code=0, latency=0.0, usage=None):
+    """Add one LLM call to today's metrics of ``dbname``.
+
+    Opens its own short transaction, so it is safe from worker threads
+    and does not keep the shared daily row locked while the caller goes
+    on. Metrics are best effort: failures are logged, never raised.
+    """
+    if not dbname:
+        return
+    usage = usage or {}
+    latency_ms = int(latency * 1000)
+    bucket = get_latency_bucket(latency_ms)
+    buckets = ', '.join(LLM_LATENCY_BUCKET_FIELDS)
+    increments = ', '.join(f'{name} = m.{name} + EXCLUDED.{name}' for name in LLM_LATENCY_BUCKET_FIELDS)
+    try:
+        with Registry(dbname).cursor() as cr:
+            cr.execute(f"""
+                INSERT INTO property_llm_metric AS m (date, caller, outcome, status_code, call_count, latency_total,
+                                                      latency_max, prompt_tokens, completion_tokens, {buckets},
+                                                      create_date, write_date)
+                VALUES (CURRENT_DATE, %s, %s, %s, 1, %s, %s, %s, %s, {', '.join(['%s'] * len(LLM_LATENCY_BUCKET_FIELDS))},
+                        now() at time zone 'UTC', now() at time zone 'UTC')
+                ON CONFLICT (date, caller, outcome, status_code) DO UPDATE
+                   SET call_count = m.call_count + 1,
+                       latency_total = m.latency_total + EXCLUDED.latency_total,
+                       latency_max = GREATEST(m.latency_max, EXCLUDED.latency_max),
+                       prompt_tokens = m.prompt_tokens + EXCLUDED.prompt_tokens,
+                       completion_tokens = m.completion_tokens + EXCLUDED.completion_tokens,
+                       {increments},
+                       write_date = EXCLUDED.write_date
+            """, [caller or 'other', outcome, status_code or 0, latency_ms, latency_ms,
+                  usage.get('prompt_tokens') or 0, usage.get('completion_tokens') or 0]
+                + [int(name == bucket) for name in LLM_LATENCY_BUCKET_FIELDS])
+    except Exception as e:
+        _logger.warning(f"LLM metrics: could not record {caller} call: {e}")
+
+
+class PropertyLLMMetric(models.Model):
+    """Daily aggregate of outbound LLM calls per caller, outcome and status code"""
+    _name = 'property.llm.metric'
+    _description = 'LLM Call Metrics'
+    _rec_name = 'date'
+    _order = 'date desc, caller, outcome'
+
+    date = fields.Date(string='Date', required=True, readonly=True, index=True)
+    caller = fields.Selection(LLM_CALLERS, string='Caller', required=True, readonly=True)
+    outcome = fields.Selection([
+        ('success', 'Success'),
+        ('cache_hit', 'Cache Hit'),
+        ('cache_miss', 'Cache Miss'),
+        ('error', 'Error (fallback)'),
+        ('timeout', 'Timeout (fallback)'),
+        ('circuit_open', 'Circuit Open (fallback)'),
+    ], string='Outcome', required=True, readonly=True,
+        help="Cache lookups are counted apart from the provider call that follows a miss. "
+             "Every outcome marked fallback left the visitor with the static text.")
+    status_code = fields.Integer(string='HTTP Status', readonly=True,
+                                 help="Last status answered by the provider, 0 when there was no answer.")
+    call_count = fields.Integer(string='Calls', readonly=True)
+    latency_total = fields.Integer(string='Total Latency (ms)', readonly=True)
+    latency_max = fields.Integer(string='Max Latency (ms)', readonly=True, aggregator='max')
+    latency_avg = fields.Float(string='Avg Latency (ms)', compute='_compute_latency_avg', digits=(16, 0))
+    prompt_tokens = fields.Integer(string='Prompt Tokens', readonly=True)
+    completion_tokens = fields.Integer(string='Completion Tokens', readonly=True)
+
+    # Latency histogram
+    latency_le_250 = fields.Integer(string='≤ 250 ms', readonly=True)
+    latency_le_500 = fields.Integer(string='≤ 500 ms', readonly=True)
+    latency_le_1000 = fields.Integer(string='≤ 1 s', readonly=True)
+    latency_le_2500 = fields.Integer(string='≤ 2.5 s', readonly=True)
+    latency_le_5000 = fields.Integer(string='≤ 5 s', readonly=True)
+    latency_le_10000 = fields.Integer(string='≤ 10 s', readonly=True)
+    latency_le_30000 = fields.Integer(string='≤ 30 s', readonly=True)
+    latency_over_30000 = fields.Integer(string='> 30 s', readonly=True)
+
+    _sql_constraints = [
+        ('metric_unique', 'unique(date, caller, outcome, status_code)',
+         'Metrics already exist for this day, caller, outcome and status!')
+    ]
+
+    @api.depends('latency_total', 'call_count')
+    def _compute_latency_avg(self):
+        for metric in self:
+            metric.latency_avg = metric.latency_total / metric.call_count if metric.call_count else 0.0
+
+    @api.model
+    def _record(self, caller, outcome, status_code=0, latency=0.0, usage=None):
+        record_llm_call(self.env.cr.dbname, caller, outcome, status_code, latency, usage)
+
+    # -------------------- REPORTING --------------------
+    @api.model
+    def _get_percentile(self, histogram, percentile):
+        """Upper bound (ms) of the bucket holding ``percentile``, None above the last bound"""
+        total = sum(histogram)
+        if not total:
+            return 0
+        threshold = total * percentile / 100.0
+        seen = 0
+        for bound, count in zip(LLM_LATENCY_BUCKETS + [None], histogram):
+            seen += count
+            if seen >= threshold:
+                return bound
+        return None
+
+    @api.model
+    def _get_report(self, date_from=None, date_to=None):
+        """Per caller summary of the metrics between ``date_from`` and ``date_to`` (inclusive)"""
+        date_to = date_to or fields.Date.context_today(self)
+        date_from = date_from or date_to - timedelta(days=6)
+        metrics = self.search([('date', '>=', date_from), ('date', '<=', date_to)])
+        fallback_outcomes = ('error', 'timeout', 'circuit_open')
+
+        report = []
+        for caller, label in LLM_CALLERS:
+            caller_metrics = metrics.filtered(lambda m: m.caller == caller)
+            if not caller_metrics:
+                continue
+            provider = caller_metrics.filtered(lambda m: m.outcome not in ('cache_hit', 'cache_miss'))
+            calls = sum(provider.mapped('call_count'))
+            histogram = [sum(provider.mapped(name)) for name in LLM_LATENCY_BUCKET_FIELDS]
+            statuses = {}
+            for metric in provider.filtered('status_code'):
+                statuses[str(metric.status_code)] = statuses.get(str(metric.status_code), 0) + metric.call_count
+            outcomes = {}
+            for metric in caller_metrics:
+                outcomes[metric.outcome] = outcomes.get(metric.outcome, 0) + metric.call_count
+            hits, misses = outcomes.get('cache_hit', 0), outcomes.get('cache_miss', 0)
+            fallbacks = sum(outcomes.get(outcome, 0) for outcome in fallback_outcomes)
+            report.append({
+                'caller': caller,
+                'name': label,
+                'calls': calls,
+                'outcomes': outcomes,
+                'status_codes': statuses,
+                'fallback_rate': round(100.0 * fallbacks / calls, 1) if calls else 0.0,
+                'cache_hit_rate': round(100.0 * hits / (hits + misses), 1) if hits + misses else None,
+                'latency_avg_ms': round(sum(provider.mapped('latency_total')) / calls) if calls else 0,
+                'latency_max_ms': max(provider.mapped('latency_max') or [0]),
+                'latency_p50_ms': self._get_percentile(histogram, 50),
+                'latency_p95_ms': self._get_percentile(histogram, 95),
+                'latency_histogram': dict(zip(LLM_LATENCY_BUCKET_FIELDS, histogram)),
+                'prompt_tokens': sum(provider.mapped('prompt_tokens')),
+                'completion_tokens': sum(provider.mapped('completion_tokens')),
+            })
+        return {
+            'date_from': fields.Date.to_string(date_from),
+            'date_to': fields.Date.to_string(date_to),
+            'callers': report,
+        }
+
+    @api.model
+    def action_export_json(self):
+        """Open the JSON export of the last 7 days"""
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/real_estate/llm_metrics.json',
+            'target': 'new',
+        }
+
+    @api.model
+    def _cron_evict(self):
+        """Drop metrics older than ``real_estate.llm_metrics_retention_days``"""
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate.llm_metrics_retention_days', LLM_METRICS_RETENTION_DAYS))
+        self.search([('date', '<', fields.Date.context_today(self) - timedelta(days=days))]).unlink()
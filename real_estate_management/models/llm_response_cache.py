@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api, tools
+
+_logger = logging.getLogger(__name__)
+
+# Defaults, overridable with the real_estate.llm_cache_* config params
+LLM_CACHE_TTL_DAYS = 30
+LLM_CACHE_MAX_ENTRIES = 5000
+
+
+class PropertyLLMResponseCache(models.Model):
+    _name = 'property.llm.response.cache'
+    _description = 'LLM Response Cache'
+    _rec_name = 'fingerprint'
+    _order = 'last_used desc, id desc'
+
+    fingerprint = fields.Char(string='Fingerprint', required=True, index=True, readonly=True)
+    model = fields.Char(string='Model', readonly=True)
+    prompt = fields.Text(string='User Prompt', readonly=True)
+    response = fields.Text(string='Response', required=True, readonly=True)
+    hit_count = fields.Integer(string='Hits', readonly=True, default=0)
+    last_used = fields.Datetime(string='Last Used', readonly=True, default=fields.Datetime.now, index=True)
+
+    _sql_constraints = [
+        ('fingerprint_unique', 'unique(fingerprint)', 'A response is already cached for this prompt!')
+    ]
+
+    @api.model
+    def _get_fingerprint(self, model, messages, params):
+        """Hash of everything that determines the completion"""
+        key = json.dumps({'model': model, 'messages': messages, 'params': params}, sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @api.model
+    def _lookup(self, fingerprint):
+        """Return the cached response for ``fingerprint``, or None.
+
+        Callers count the hit or miss in property.llm.metric.
+        """
+        ttl = int(self.env['ir.config_parameter'].sudo().get_param('real_estate.llm_cache_ttl_days',
+                                                                   LLM_CACHE_TTL_DAYS))
+        self.env.cr.execute("""
+            UPDATE property_llm_response_cache
+               SET hit_count = COALESCE(hit_count, 0) + 1, last_used = now() at time zone 'UTC'
+             WHERE fingerprint = %s AND create_date >= %s
+         RETURNING response
+        """, [fingerprint, fields.Datetime.now() - timedelta(days=ttl)])
+        row = self.env.cr.fetchone()
+        return row[0] if row else None
+
+    @api.model
+    def _store(self, fingerprint, model, messages, response):
+        self.env.cr.execute("""
+            INSERT INTO property_llm_response_cache (fingerprint, model, prompt, response, hit_count, last_used,
+                                                     create_date, write_date)
+            VALUES (%s, %s, %s, %s, 0, now() at time zone 'UTC', now() at time zone 'UTC', now() at time zone 'UTC')
+            ON CONFLICT (fingerprint) DO UPDATE
+               SET response = EXCLUDED.response, hit_count = 0, last_used = EXCLUDED.last_used,
+                   create_date = EXCLUDED.create_date, write_date = EXCLUDED.write_date
+        """, [fingerprint, model, messages[-1]['content'] if messages else '', response])
+
+    @api.model
+    def _cron_evict(self):
+        """Drop expired responses, then the least recently used ones above the size cap"""
+        ICP = self.env['ir.config_parameter'].sudo()
+        ttl = int(ICP.get_param('real_estate.llm_cache_ttl_days', LLM_CACHE_TTL_DAYS))
+        max_entries = int(ICP.get_param('real_estate.llm_cache_max_entries', LLM_CACHE_MAX_ENTRIES))
+        self.env.cr.execute("DELETE FROM property_llm_response_cache WHERE create_date < %s",
+                            [fields.Datetime.now() - timedelta(days=ttl)])
+        expired = self.env.cr.rowcount
+        self.env.cr.execute("""
+            DELETE FROM property_llm_response_cache
+             WHERE id IN (SELECT id FROM property_llm_response_cache
+                           ORDER BY last_used DESC, id DESC
+                          OFFSET %s)
+        """, [max_entries])
+        _logger.info(f"🤖 LLM response cache: removed {expired} expired and "
+                     f"{self.env.cr.rowcount} least recently used entries")
+
+
+class PropertyLLMResponseCacheStat(models.Model):
+    """Daily hit rate of the response cache, read from the cache_hit and
+    cache_miss rows of property.llm.metric"""
+    _name = 'property.llm.response.cache.stat'
+    _description = 'LLM Response Cache Daily Statistics'
+    _rec_name = 'date'
+    _order = 'date desc'
+    _auto = False
+
+    date = fields.Date(string='Date', readonly=True)
+    hits = fields.Integer(string='Hits', readonly=True)
+    misses = fields.Integer(string='Misses', readonly=True)
+    hit_rate = fields.Float(string='Hit Rate (%)', readonly=True, digits=(16, 1), aggregator='avg')
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT id, date, hits, misses,
+                       CASE WHEN hits + misses > 0 THEN 100.0 * hits / (hits + misses) ELSE 0.0 END AS hit_rate
+                  FROM (
+                    SELECT min(id) AS id, date,
+                           COALESCE(sum(call_count) FILTER (WHERE outcome = 'cache_hit'), 0) AS hits,
+                           COALESCE(sum(call_count) FILTER (WHERE outcome = 'cache_miss'), 0) AS misses
+                      FROM property_llm_metric
+                     WHERE outcome IN ('cache_hit', 'cache_miss')
+                  GROUP BY date
+                  ) daily
+            )
+        """)
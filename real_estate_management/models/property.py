@@ -1,10 +1,113 @@
 from odoo import models, fields, api, _
+from odoo.osv import expression
+from odoo.tools import SQL, html_sanitize
+from odoo.tools.lru import LRU
+from odoo.tools.sql import create_index
 import logging
-import requests
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from markupsafe import Markup
+from datetime import timedelta
+
+from .llm_client import LLMError, AdaptiveConcurrencyLimiter, chat_completion, parse_json_answer
+from .property_ai_cache import TRENDING_NEWS_KEY
 
 _logger = logging.getLogger(__name__)
 
+# Marker colours for the public map, picked by category id so that a
+# category keeps its colour across the paged marker requests.
+MAP_MARKER_PALETTE = ["#059669", "#dc2626", "#7c3aed", "#ea580c", "#2563eb", "#d97706", "#0891b2", "#9333ea"]
+MAP_MARKER_DEFAULT_COLOR = '#4f46e5'
+
+# Below this zoom level the public map shows server-side clusters instead
+# of individual markers.
+MAP_CLUSTER_MAX_ZOOM = 12
+
+# Geocoding queue: properties are geocoded by _cron_geocode_pending in
+# batches, at most GEOCODE_RATE_LIMIT provider requests per second (shared
+# with the backfill and forced geocoding, see _get_geocode_throttle), and
+# retried with exponential backoff up to GEOCODE_MAX_ATTEMPTS times.
+# Batch size and rate can be overridden with the
+# real_estate.geocode_batch_size / real_estate.geocode_rate_limit params.
+GEOCODE_ADDRESS_FIELDS = {'street', 'street2', 'city', 'zip_code', 'state_id', 'country_id'}
+GEOCODE_BATCH_SIZE = 50
+GEOCODE_RATE_LIMIT = 1.0
+GEOCODE_MAX_ATTEMPTS = 5
+GEOCODE_RETRY_DELAY = timedelta(minutes=5)
+
+
+class RateLimiter:
+    """Space successive calls so that at most ``rate`` happen per second.
+
+    Safe to share between threads: each caller reserves the next slot
+    under the lock and sleeps outside of it. With a ``parent``, calls
+    also wait for a slot of the parent, so several limiters can stay
+    within a common budget.
+    """
+
+    def __init__(self, rate, parent=None):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_call = 0.0
+        self.parent = parent
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self.lock:
+            self.interval = 1.0 / rate if rate > 0 else 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            call_at = max(now, self.next_call)
+            self.next_call = call_at + self.interval
+        if call_at > now:
+            time.sleep(call_at - now)
+        if self.parent:
+            self.parent.wait()
+
+
+# Every geocoder request of the process goes through this limiter, so the
+# queue, backfills and forced geocoding together stay within the provider
+# budget.
+_geocode_throttle = RateLimiter(GEOCODE_RATE_LIMIT)
+
+
+# AI content queue: properties are (re)generated by
+# _cron_generate_ai_content when published or when a field used in the
+# prompt changes, AI_GENERATION_CONCURRENCY at a time. Batch size and
+# concurrency can be overridden with the real_estate.ai_generation_*
+# config params. The regenerate button runs selections of up to
+# AI_GENERATION_INLINE_LIMIT properties right away and queues larger ones.
+AI_CONTENT_FIELDS = {'name', 'city', 'price', 'plot_area'}
+AI_GENERATION_BATCH_SIZE = 20
+AI_GENERATION_INLINE_LIMIT = 5
+AI_GENERATION_CONCURRENCY = 4
+AI_GENERATION_CHUNK_SIZE = 10
+AI_GENERATION_REQUESTS_PER_MINUTE = 30
+AI_GENERATION_MAX_ATTEMPTS = 3
+AI_GENERATION_QUEUE_DOMAIN = [
+    ('is_published', '=', True),
+    '|', ('ai_generation_state', '=', 'pending'),
+    '&', ('ai_generation_state', '=', False), ('ai_content_generated', '=', False),
+]
+
+# HTML values of the cached city investment info
+CITY_INVESTMENT_HTML_KEYS = ('ai_investment_reasons', 'ai_growth_potential', 'ai_infrastructure', 'ai_market_trends')
+
+# Writing any of these fields invalidates the cached public data: map
+# aggregates, city directory and rendered map/listing pages.
+PUBLIC_CACHE_FIELDS = {
+    'is_published', 'is_featured', 'name', 'status', 'city', 'category_id',
+    'price', 'plot_area', 'image', 'gallery_image_ids', 'latitude', 'longitude',
+    'street', 'street2', 'zip_code', 'state_id', 'country_id',
+}
+
+# Public website data (map clusters, city directory), per worker, keyed by
+# database and public cache version so that bumping the version retires it.
+_public_data_cache = LRU(512)
+
 
 class Property(models.Model):
     _name = 'property.property'
@@ -72,7 +175,7 @@ class Property(models.Model):
     # Address
     street = fields.Char(string='Street*')
     street2 = fields.Char(string='Street 2')
-    city = fields.Char(string='City*', required=True)
+    city = fields.Char(string='City*', required=True, index=True)
     zip_code = fields.Char(string='ZIP*',required=True)
     state_id = fields.Many2one(
         'res.country.state', string='State*',
@@ -95,12 +198,21 @@ class Property(models.Model):
     gated_community = fields.Boolean(string='Gated Community')
 
     # Geolocation
-    latitude = fields.Float(string='Latitude', digits=(16, 5),
-                            compute='_compute_geolocation', store=True)
-    longitude = fields.Float(string='Longitude', digits=(16, 5),
-                             compute='_compute_geolocation', store=True)
-    date_localization = fields.Date(string='Geolocation Date',
-                                    compute='_compute_geolocation', store=True)
+    latitude = fields.Float(string='Latitude', digits=(16, 5), readonly=True)
+    longitude = fields.Float(string='Longitude', digits=(16, 5), readonly=True)
+    date_localization = fields.Date(string='Geolocation Date', readonly=True)
+    geocode_state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Geocoded'),
+        ('failed', 'Failed'),
+        ('none', 'No Address'),
+    ], string='Geocoding Status', compute='_compute_geolocation', store=True, index=True)
+    geocode_attempts = fields.Integer(string='Geocoding Attempts',
+                                      compute='_compute_geolocation', store=True)
+    geocode_next_try = fields.Datetime(string='Next Geocoding Attempt',
+                                       compute='_compute_geolocation', store=True)
+    address_hash = fields.Char(string='Address Fingerprint', compute='_compute_geolocation', store=True,
+                               help="Fingerprint of the normalized address last queued for geocoding.")
 
     # Contact Info
     contact_name = fields.Char(string='Contact Person*',required=True)
@@ -128,6 +240,7 @@ class Property(models.Model):
 
     # Metadata
     is_published = fields.Boolean(string='Published', default=False)
+    # Updated in batches from property.view.hit, a few minutes behind the visits
     views = fields.Integer(string='Views', default=0)
     last_viewed = fields.Datetime(string='Last Viewed')
     nearby_landmarks = fields.Text(string='Nearby Landmarks*',required=True)
@@ -140,15 +253,21 @@ class Property(models.Model):
     ai_lifestyle_benefits = fields.Html(readonly=True)
     ai_content_generated = fields.Boolean(default=False)
     ai_generation_date = fields.Datetime()
-
-    # ==================== CITY INVESTMENT FIELDS ====================
-    city_investment_reasons = fields.Html(string='City Investment Reasons', readonly=True)
-    city_growth_potential = fields.Html(string='City Growth Potential', readonly=True)
-    city_infrastructure = fields.Html(string='City Infrastructure', readonly=True)
-    city_market_trends = fields.Html(string='City Market Trends', readonly=True)
-    city_investment_generated = fields.Boolean(default=False)
-    city_investment_date = fields.Datetime()
-    last_city_processed = fields.Char(string='Last City Processed')
+    ai_generation_state = fields.Selection([
+        ('pending', 'Queued'),
+        ('done', 'Generated'),
+        ('failed', 'Failed'),
+    ], string='AI Generation Status', index=True, readonly=True, copy=False)
+    ai_generation_attempts = fields.Integer(string='AI Generation Attempts', readonly=True, copy=False)
+
+    def init(self):
+        # Spatial index on the coordinates, used by _search_bbox and
+        # _search_nearest. PostgreSQL keeps it in sync with every write of
+        # latitude/longitude, and builds it over existing rows on upgrade.
+        create_index(self.env.cr, 'property_property_geo_point_index', self._table,
+                     ['point(longitude, latitude)'], method='gist')
+        # Version of the public website data, see _get_public_cache_token
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS property_public_cache_seq")
 
     # -------------------- COMPUTE METHODS --------------------
     @api.depends('price', 'plot_area')
@@ -166,70 +285,426 @@ class Property(models.Model):
         for rec in self:
             rec.image_count = len(rec.gallery_image_ids)
 
+    # -------------------- CRUD --------------------
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super(Property, self).create(vals_list)
+        self._invalidate_public_caches()
+        records._trigger_geocoding()
+        records._enqueue_ai_generation()
+        return records
+
+    def write(self, vals):
+        res = super(Property, self).write(vals)
+        if PUBLIC_CACHE_FIELDS.intersection(vals):
+            self._invalidate_public_caches()
+        if GEOCODE_ADDRESS_FIELDS.intersection(vals) and 'pending' in self.mapped('geocode_state'):
+            self._trigger_geocoding()
+        if AI_CONTENT_FIELDS.intersection(vals):
+            self._enqueue_ai_generation(regenerate=True)
+        elif vals.get('is_published'):
+            self._enqueue_ai_generation()
+        return res
+
+    def unlink(self):
+        res = super(Property, self).unlink()
+        self._invalidate_public_caches()
+        return res
+
+    # -------------------- IMAGE URLS --------------------
+    def _get_image_url(self, size='popup'):
+        """Cacheable URL of the cover image (or first gallery image) in ``size``.
+
+        The ``unique`` stamp changes whenever the record is written, so the
+        browser can keep the image for as long as the URL stays the same.
+        """
+        self.ensure_one()
+        return self._build_image_url(self.id, self.write_date, size)
+
+    @api.model
+    def _build_image_url(self, property_id, write_date, size='popup'):
+        """Same as ``_get_image_url``, from values already fetched with ``read``"""
+        unique = write_date.strftime('%Y%m%d%H%M%S') if write_date else ''
+        return f'/property/{property_id}/image/{size}?unique={unique}'
+
+    def _get_gallery_image_url(self, attachment, size='gallery'):
+        """Cacheable URL of one gallery attachment of this property in ``size``."""
+        self.ensure_one()
+        return f'/property/{self.id}/gallery/{attachment.id}/{size}?unique={attachment.checksum or ""}'
+
+    def _get_cover_image_source(self):
+        """Return ``(record, field_name)`` holding the image shown on the map.
+
+        Uses ``bin_size`` so that checking for a cover image does not load it.
+        """
+        self.ensure_one()
+        if self.with_context(bin_size=True).image:
+            return self, 'image'
+        if self.gallery_image_ids:
+            return self.gallery_image_ids[0], 'raw'
+        return self, 'image'
+
+    # -------------------- MAP HELPERS --------------------
+    @api.model
+    def _get_map_domain(self, city=None, category_id=None):
+        """Domain of the published, geocoded properties shown on the public map"""
+        domain = [
+            ('is_published', '=', True),
+            ('latitude', '!=', False),
+            ('longitude', '!=', False),
+        ]
+        if city:
+            domain.append(('city', '=', city))
+        if category_id:
+            domain.append(('category_id', '=', category_id))
+        return domain
+
+    def _geo_point_sql(self):
+        return SQL("point(%s, %s)", SQL.identifier(self._table, 'longitude'), SQL.identifier(self._table, 'latitude'))
+
+    @api.model
+    def _search_bbox(self, west, south, east, north, domain=None, offset=0, limit=None, order=None):
+        """Search the properties of ``domain`` located inside a bounding box.
+
+        The box test is written against ``point(longitude, latitude)`` so that
+        PostgreSQL answers it from the GiST index instead of a table scan.
+        """
+        domain = expression.AND([domain or [], [('latitude', '!=', False), ('longitude', '!=', False)]])
+        query = self._search(domain, offset=offset, limit=limit, order=order)
+        query.add_where(SQL(
+            "%s <@ box(point(%s, %s), point(%s, %s))",
+            self._geo_point_sql(), float(west), float(south), float(east), float(north),
+        ))
+        return self.browse(query)
+
+    @api.model
+    def _search_nearest(self, latitude, longitude, limit=10, domain=None):
+        """Return the ``limit`` properties of ``domain`` closest to a location.
+
+        Uses the GiST index's nearest-neighbour ordering. Distances are
+        compared in degrees, which ranks correctly at city scale.
+        """
+        domain = expression.AND([domain or [], [('latitude', '!=', False), ('longitude', '!=', False)]])
+        query = self._search(domain, limit=limit)
+        query.order = SQL("%s <-> point(%s, %s)", self._geo_point_sql(), float(longitude), float(latitude))
+        return self.browse(query)
+
+    @api.model
+    def _get_map_bounds(self, domain):
+        """Return ``[[south, west], [north, east]]`` covering ``domain``, or None"""
+        [(south, north, west, east)] = self._read_group(
+            domain, aggregates=['latitude:min', 'latitude:max', 'longitude:min', 'longitude:max'])
+        if south is None or west is None:
+            return None
+        return [[south, west], [north, east]]
+
+    @api.model
+    def _get_map_cluster_cell_size(self, zoom):
+        """Grid cell size in degrees, roughly 64px on screen at ``zoom``"""
+        return 360.0 / (2 ** max(zoom, 0)) / 4
+
+    @api.model
+    def _get_map_clusters(self, zoom, west, south, east, north, city=None, category_id=None):
+        """Clusters of the map properties visible in the given viewport.
+
+        The aggregation over the whole catalogue is cached per zoom level and
+        filter, so panning only filters the cached cells. A cell is kept when
+        it overlaps the viewport, even if its centroid lies outside.
+        """
+        clusters = self._get_public_data(
+            ('map_clusters', zoom, city or '', category_id or 0),
+            lambda: self._compute_map_clusters(zoom, city or '', category_id or 0))
+        return [
+            cluster for cluster in clusters
+            if cluster['south'] <= north and cluster['north'] >= south
+            and cluster['west'] <= east and cluster['east'] >= west
+        ]
+
+    @api.model
+    def _compute_map_clusters(self, zoom, city, category_id):
+        cell = self._get_map_cluster_cell_size(zoom)
+        query = self.sudo()._search(self._get_map_domain(city=city, category_id=category_id))
+        self.env.cr.execute(SQL(
+            """
+            SELECT FLOOR(property_property.latitude / %(cell)s), FLOOR(property_property.longitude / %(cell)s),
+                   COUNT(*), AVG(property_property.latitude), AVG(property_property.longitude),
+                   MIN(property_property.price), MAX(property_property.price), AVG(property_property.price)
+              FROM %(from_clause)s
+             WHERE %(where_clause)s
+          GROUP BY 1, 2
+            """,
+            from_clause=query.from_clause,
+            where_clause=query.where_clause or SQL("TRUE"),
+            cell=cell,
+        ))
+        return tuple(
+            {
+                'count': count,
+                'latitude': float(latitude),
+                'longitude': float(longitude),
+                'price_min': float(price_min or 0),
+                'price_max': float(price_max or 0),
+                'price_avg': float(price_avg or 0),
+                # Bounds of the grid cell
+                'south': row * cell,
+                'north': (row + 1) * cell,
+                'west': column * cell,
+                'east': (column + 1) * cell,
+            }
+            for row, column, count, latitude, longitude, price_min, price_max, price_avg in self.env.cr.fetchall()
+        )
+
+    # -------------------- PUBLIC CACHE VERSION --------------------
+    # Public data derived from properties and categories is cached per
+    # worker under a version kept in a PostgreSQL sequence. Changes bump it
+    # once their transaction commits; every worker sees the new value on
+    # its next read, and Odoo's own caches are left alone.
+    @api.model
+    def _get_public_cache_token(self):
+        """Opaque token that changes whenever the public data changes.
+
+        Rendered pages and aggregates stored outside the ORM cache remember
+        the token they were built with and are discarded once it changes.
+        """
+        self.env.cr.execute("SELECT last_value FROM property_public_cache_seq")
+        return str(self.env.cr.fetchone()[0])
+
+    @api.model
+    def _invalidate_public_caches(self):
+        """Bump the public cache version after the current transaction commits.
+
+        Bumping before the commit would let another worker cache the old
+        data under the new version. Registered once per transaction.
+        """
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get('property_public_cache_bump'):
+            return
+        postcommit.data['property_public_cache_bump'] = True
+        registry = self.env.registry
+
+        def bump():
+            with registry.cursor() as cr:
+                cr.execute("SELECT nextval('property_public_cache_seq')")
+        postcommit.add(bump)
+
+    @api.model
+    def _get_public_data(self, key, compute):
+        """Return ``compute()``, cached per worker until the public data changes"""
+        cache_key = (self.env.cr.dbname, self._get_public_cache_token()) + key
+        try:
+            return _public_data_cache[cache_key]
+        except KeyError:
+            value = _public_data_cache[cache_key] = compute()
+            return value
+
+    @api.model
+    def _get_city_list(self, published_only=True):
+        """Sorted city names for the website city pickers"""
+        return [
+            city for city, published_count, total_count in self._get_city_directory()
+            if published_count or not published_only
+        ]
+
+    @api.model
+    def _get_city_directory(self):
+        """Return ``(city, published_count, total_count)`` for every city.
+
+        Cached until a property is created, deleted, or has its city or
+        publication changed (see ``write``).
+        """
+        return self._get_public_data(('city_directory',), self._compute_city_directory)
+
+    @api.model
+    def _compute_city_directory(self):
+        self.env.cr.execute(SQL(
+            """
+            SELECT city, COUNT(*) FILTER (WHERE is_published), COUNT(*)
+              FROM %s
+             WHERE city IS NOT NULL AND city != ''
+          GROUP BY city
+            """,
+            SQL.identifier(self._table),
+        ))
+        return tuple(sorted(self.env.cr.fetchall()))
+
+    @api.model
+    def _get_map_marker_color(self, category):
+        if not category:
+            return MAP_MARKER_DEFAULT_COLOR
+        return MAP_MARKER_PALETTE[category.id % len(MAP_MARKER_PALETTE)]
+
+    # -------------------- GEOCODING --------------------
     @api.depends('street', 'street2', 'city', 'zip_code', 'state_id', 'country_id')
     def _compute_geolocation(self):
-        geo = self.env['base.geocoder']
+        """Queue the property for geocoding when its address changes.
+
+        The provider is only called from ``_cron_geocode_pending`` so that
+        writes never wait on an external HTTP round trip. Rewriting an
+        address with an equivalent value keeps the current result.
+        """
+        GeocodeCache = self.env['property.geocode.cache']
         for rec in self:
-            # Construct full address
-            street = ' '.join(filter(None, [rec.street, rec.street2]))
-            address_components = {
-                'street': street,
-                'zip': rec.zip_code or '',
-                'city': rec.city or '',
-                'state': rec.state_id.name or '',
-                'country': rec.country_id.name or '',
-            }
-            if not (address_components['street'] or address_components['zip'] or address_components['city']):
-                rec.latitude = rec.longitude = False
-                rec.date_localization = False
-                _logger.info(f"Skipping geocode for {rec.name}: insufficient address info {address_components}")
+            address_hash = GeocodeCache._get_fingerprint(rec._get_geocode_address() or {})
+            if rec.geocode_state and rec.address_hash == address_hash:
+                rec.geocode_state = rec.geocode_state
+                rec.geocode_attempts = rec.geocode_attempts
+                rec.geocode_next_try = rec.geocode_next_try
+                rec.address_hash = address_hash
                 continue
+            # Rows geocoded before the queue existed keep their coordinates
+            if not rec.geocode_state and rec.latitude and rec.longitude:
+                rec.geocode_state = 'done'
+            else:
+                rec.geocode_state = 'pending'
+            rec.geocode_attempts = 0
+            rec.geocode_next_try = False
+            rec.address_hash = address_hash
+
+    def _trigger_geocoding(self):
+        cron = self.env.ref('real_estate_management.ir_cron_geocode_properties', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+
+    def _get_geocode_address(self):
+        """Structured address passed to ``base.geocoder``, or None if too incomplete"""
+        self.ensure_one()
+        street = ' '.join(filter(None, [self.street, self.street2]))
+        address_components = {
+            'street': street,
+            'zip': self.zip_code or '',
+            'city': self.city or '',
+            'state': self.state_id.name or '',
+            'country': self.country_id.name or '',
+        }
+        if not (address_components['street'] or address_components['zip'] or address_components['city']):
+            return None
+        return address_components
 
-            try:
-                # Log the query
-                _logger.info(f"Geocoding property {rec.name} with params: {address_components}")
-
-                # Query geocoder with structured parameters
-                query = geo.geo_query_address(**address_components)
-                coords = geo.geo_find(query, force_country=address_components['country'])
-
-                # Fallback: try single string query if structured fails
-                if not coords or len(coords) != 2:
-                    address_str = ', '.join(
-                        filter(None, [rec.street, rec.street2, rec.city, rec.state_id.name, rec.country_id.name]))
-                    _logger.info(
-                        f"Structured geocode failed for {rec.name}, trying fallback with address string: {address_str}")
-                    coords = geo.geo_find(address_str)
-
-                if coords and len(coords) == 2:
-                    rec.latitude, rec.longitude = coords
-                    rec.date_localization = fields.Date.context_today(rec)
-                    _logger.info(f"Geocoded {rec.name}: latitude={rec.latitude}, longitude={rec.longitude}")
-                else:
-                    rec.latitude = rec.longitude = False
-                    rec.date_localization = False
-                    _logger.error(f"Geocode failed for {rec.name}: {address_components}")
-
-            except Exception as e:
-                rec.latitude = rec.longitude = False
-                rec.date_localization = False
-                _logger.error(f"Geocode error for {rec.name}: {e}")
+    @api.model
+    def _get_geocode_throttle(self):
+        """The limiter shared by all geocoder requests, at ``real_estate.geocode_rate_limit``"""
+        _geocode_throttle.set_rate(float(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate.geocode_rate_limit', GEOCODE_RATE_LIMIT)))
+        return _geocode_throttle
 
-    # REPLACE your generate_ai_content and get_city_investment_info methods with these:
+    def _geocode_address(self, address_components, throttle=None):
+        """Query the geocoder for ``address_components``, return (lat, lng) or None.
 
-    def generate_ai_content(self):
-        """Generate AI content using FREE Groq API"""
+        ``throttle`` defaults to the shared geocoder limiter; a custom one
+        should have it as parent.
+        """
+        self.ensure_one()
+        geo = self.env['base.geocoder']
+        throttle = throttle or self._get_geocode_throttle()
+
+        # Log the query
+        _logger.info(f"Geocoding property {self.name} with params: {address_components}")
+
+        # Query geocoder with structured parameters
+        throttle.wait()
+        query = geo.geo_query_address(**address_components)
+        coords = geo.geo_find(query, force_country=address_components['country'])
+
+        # Fallback: try single string query if structured fails
+        if not coords or len(coords) != 2:
+            address_str = ', '.join(
+                filter(None, [self.street, self.street2, self.city, self.state_id.name, self.country_id.name]))
+            _logger.info(
+                f"Structured geocode failed for {self.name}, trying fallback with address string: {address_str}")
+            throttle.wait()
+            coords = geo.geo_find(address_str)
+
+        if coords and len(coords) == 2:
+            return coords
+        return None
+
+    def _geocode_now(self, throttle=None, force=False):
+        """Geocode one queued property and record the outcome.
+
+        Failures are retried with exponential backoff until
+        GEOCODE_MAX_ATTEMPTS is reached, after which the property is
+        marked as failed. ``force`` bypasses the geocode cache.
+        """
         self.ensure_one()
+        address_components = self._get_geocode_address()
+        if not address_components:
+            _logger.info(f"Skipping geocode for {self.name}: insufficient address info")
+            self.write({
+                'latitude': False,
+                'longitude': False,
+                'date_localization': False,
+                'geocode_state': 'none',
+            })
+            return False
 
-        # Get Groq API key (FREE from https://console.groq.com)
-        api_key = self.env['ir.config_parameter'].sudo().get_param('groq.api_key')
+        GeocodeCache = self.env['property.geocode.cache']
+        cached = GeocodeCache.browse() if force else GeocodeCache._lookup(address_components)
+        if cached:
+            coords = cached._get_coords()
+        else:
+            try:
+                coords = self._geocode_address(address_components, throttle=throttle)
+            except Exception as e:
+                # Transient errors are retried and never cached
+                _logger.error(f"Geocode error for {self.name}: {e}")
+                coords = None
+            else:
+                provider = self.env['base.geocoder']._get_provider().tech_name
+                GeocodeCache._store(address_components, coords, provider=provider)
 
-        if not api_key:
-            _logger.error("❌ Groq API key not configured. Get free key from https://console.groq.com")
-            return False
+        if coords:
+            latitude, longitude = coords
+            self.write({
+                'latitude': latitude,
+                'longitude': longitude,
+                'date_localization': fields.Date.context_today(self),
+                'geocode_state': 'done',
+                'geocode_attempts': 0,
+                'geocode_next_try': False,
+            })
+            _logger.info(f"Geocoded {self.name}: latitude={latitude}, longitude={longitude}")
+            return True
 
-        _logger.info(f"🔄 Generating AI content for property: {self.name}")
+        attempts = self.geocode_attempts + 1
+        # A cached negative result will not change before it expires
+        if cached or attempts >= GEOCODE_MAX_ATTEMPTS:
+            _logger.error(f"Geocode failed for {self.name} after {attempts} attempts: {address_components}")
+            self.write({
+                'geocode_state': 'failed',
+                'geocode_attempts': attempts,
+                'geocode_next_try': False,
+            })
+        else:
+            self.write({
+                'geocode_attempts': attempts,
+                'geocode_next_try': fields.Datetime.now() + GEOCODE_RETRY_DELAY * 2 ** (attempts - 1),
+            })
+        return False
+
+    @api.model
+    def _cron_geocode_pending(self, batch_size=None):
+        """Geocode one batch of queued properties, committing after each one"""
+        ICP = self.env['ir.config_parameter'].sudo()
+        batch_size = batch_size or int(ICP.get_param('real_estate.geocode_batch_size', GEOCODE_BATCH_SIZE))
+
+        properties = self.search([
+            ('geocode_state', '=', 'pending'),
+            '|', ('geocode_next_try', '=', False), ('geocode_next_try', '<=', fields.Datetime.now()),
+        ], limit=batch_size, order='geocode_next_try, id')
+        for prop in properties:
+            prop._geocode_now()
+            self.env.cr.commit()
+
+        _logger.info(f"Geocoding queue: processed {len(properties)} properties")
+        # A full batch means more are probably waiting: run again right away
+        if len(properties) == batch_size:
+            self._trigger_geocoding()
 
+    # REPLACE your generate_ai_content and get_city_investment_info methods with these:
+
+    def _get_ai_content_messages(self):
+        """Chat messages asking the LLM for the AI content of this property"""
+        self.ensure_one()
         prompt = (
             f"Generate real estate data for '{self.name}' in {self.city}.\n"
             f"Price: ₹{self.price:,.0f}, Area: {self.plot_area} sqft\n\n"
@@ -241,119 +716,227 @@ class Property(models.Model):
             f"- lifestyle_benefits\n"
             f"Return ONLY valid JSON."
         )
+        return [
+            {'role': 'system', 'content': 'You are a real estate analyst. Return only JSON.'},
+            {'role': 'user', 'content': prompt}
+        ]
 
-        headers = {
-            'Authorization': f'Bearer {api_key}',
-            'Content-Type': 'application/json'
+    @api.model
+    def _get_ai_content_vals(self, ai_data):
+        """Values to write for the parsed LLM answer ``ai_data``"""
+        # Convert to HTML
+        def to_html(data):
+            if not data:
+                return '<ul><li>Information not available</li></ul>'
+            if isinstance(data, list):
+                items = ''.join([f'<li>{item}</li>' for item in data])
+                return f'<ul>{items}</ul>'
+            return f'<ul><li>{data}</li></ul>'
+
+        return {
+            'ai_key_highlights': to_html(ai_data.get('key_highlights', [])),
+            'ai_investment_data': to_html(ai_data.get('investment_data', [])),
+            'ai_nearby_places': to_html(ai_data.get('nearby_places', [])),
+            'ai_unique_features': to_html(ai_data.get('unique_features', [])),
+            'ai_lifestyle_benefits': to_html(ai_data.get('lifestyle_benefits', [])),
+            'ai_content_generated': True,
+            'ai_generation_date': fields.Datetime.now(),
+            'ai_generation_state': 'done',
         }
 
-        payload = {
-            'model': 'llama-3.3-70b-versatile',  # FREE Groq model
-            'messages': [
-                {'role': 'system', 'content': 'You are a real estate analyst. Return only JSON.'},
-                {'role': 'user', 'content': prompt}
-            ],
-            'max_tokens': 800,
-            'temperature': 0.3
-        }
+    def generate_ai_content(self):
+        """Generate AI content using FREE Groq API"""
+        self.ensure_one()
+
+        _logger.info(f"🔄 Generating AI content for property: {self.name}")
 
         try:
-            _logger.info("📤 Calling FREE Groq API...")
+            ai_data = self.env['property.llm.client']._chat_json(
+                self._get_ai_content_messages(), use_cache=True, max_tokens=800, temperature=0.3,
+                caller='property_ai')
+            _logger.info(f"✅ Parsed AI data with keys: {list(ai_data.keys())}")
+        except LLMError as e:
+            _logger.error(f"❌ AI content generation failed for {self.name}: {e}")
+            return False
 
-            response = requests.post(
-                'https://api.groq.com/openai/v1/chat/completions',  # Groq endpoint
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+        self.write(self._get_ai_content_vals(ai_data))
 
-            _logger.info(f"📥 Response status: {response.status_code}")
+        _logger.info(f"✅ AI content saved for property: {self.name}")
+        return True
 
-            if response.status_code != 200:
-                _logger.error(f"API Error: {response.text}")
-                return False
+    def _generate_ai_content_batch(self, origin='manual', commit=False):
+        """Generate the AI content of ``self`` on a bounded thread pool.
 
-            response_data = response.json()
-            response_text = response_data['choices'][0]['message']['content'].strip()
+        Worker threads only talk to the LLM; results are written back
+        from the calling thread every AI_GENERATION_CHUNK_SIZE properties,
+        committing each chunk when ``commit`` is set. Concurrency is
+        halved whenever the provider rate limits us and calls are spaced
+        to stay under the configured requests per minute. Prompts already
+        answered are served from property.llm.response.cache.
 
-            # Clean JSON
-            if response_text.startswith('```'):
-                lines = response_text.split('\n')
-                response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
+        Returns the property.ai.generation.run report of the batch.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        concurrency = int(ICP.get_param('real_estate.ai_generation_concurrency', AI_GENERATION_CONCURRENCY))
+        chunk_size = int(ICP.get_param('real_estate.ai_generation_chunk_size', AI_GENERATION_CHUNK_SIZE))
+        requests_per_minute = float(ICP.get_param('real_estate.ai_generation_requests_per_minute',
+                                                  AI_GENERATION_REQUESTS_PER_MINUTE))
+
+        started = time.monotonic()
+        run = self.env['property.ai.generation.run'].sudo().create({
+            'origin': origin,
+            'total_count': len(self),
+            'concurrency': concurrency,
+        })
+        if commit:
+            self.env.cr.commit()
+
+        LLM = self.env['property.llm.client']
+        ResponseCache = self.env['property.llm.response.cache'].sudo()
+        settings = LLM._get_settings()
+        api_key = LLM._get_api_key()
+        llm_params = {'max_tokens': 800, 'temperature': 0.3, 'caller': 'property_ai'}
+        use_cache = not self.env['property.ai.cache'].sudo()._is_caching_disabled()
+        jobs, fingerprints, results = {}, {}, []
+        for prop in self:
+            messages = prop._get_ai_content_messages()
+            if not use_cache:
+                jobs[prop.id] = messages
+                continue
+            fingerprint = fingerprints[prop.id] = LLM._get_cache_fingerprint(settings, messages, **llm_params)
+            lookup_started = time.monotonic()
+            answer = ResponseCache._lookup(fingerprint)
+            self.env['property.llm.metric']._record('property_ai', 'cache_miss' if answer is None else 'cache_hit',
+                                                    latency=time.monotonic() - lookup_started)
+            if answer is None:
+                jobs[prop.id] = messages
+            else:
+                results.append((prop.id, answer, None))
+        limiter = AdaptiveConcurrencyLimiter(concurrency)
+        throttle = RateLimiter(requests_per_minute / 60)
 
+        def generate(property_id):
             try:
-                ai_data = json.loads(response_text)
-                _logger.info(f"✅ Parsed AI data with keys: {list(ai_data.keys())}")
-            except json.JSONDecodeError as e:
-                _logger.error(f"JSON parse error: {e}\nResponse: {response_text}")
-                return False
-
-            # Convert to HTML
-            def to_html(data):
-                if not data:
-                    return '<ul><li>Information not available</li></ul>'
-                if isinstance(data, list):
-                    items = ''.join([f'<li>{item}</li>' for item in data])
-                    return f'<ul>{items}</ul>'
-                return f'<ul><li>{data}</li></ul>'
-
-            self.write({
-                'ai_key_highlights': to_html(ai_data.get('key_highlights', [])),
-                'ai_investment_data': to_html(ai_data.get('investment_data', [])),
-                'ai_nearby_places': to_html(ai_data.get('nearby_places', [])),
-                'ai_unique_features': to_html(ai_data.get('unique_features', [])),
-                'ai_lifestyle_benefits': to_html(ai_data.get('lifestyle_benefits', [])),
-                'ai_content_generated': True,
-                'ai_generation_date': fields.Datetime.now(),
+                with limiter:
+                    throttle.wait()
+                    answer = chat_completion(settings, api_key, jobs[property_id],
+                                             on_rate_limited=limiter.back_off, **llm_params)
+                return property_id, answer, None
+            except LLMError as e:
+                return property_id, None, e
+
+        failures = []
+        success_count = failure_count = 0
+
+        def flush():
+            nonlocal success_count, failure_count
+            for property_id, answer, error in results:
+                prop = self.browse(property_id)
+                if error is None:
+                    try:
+                        ai_data = parse_json_answer(answer)
+                    except LLMError as e:
+                        error = e
+                if error is None:
+                    if use_cache and property_id in jobs:
+                        ResponseCache._store(fingerprints[property_id], settings['model'], jobs[property_id], answer)
+                    prop.write(self._get_ai_content_vals(ai_data))
+                    success_count += 1
+                else:
+                    attempts = prop.ai_generation_attempts + 1
+                    prop.write({
+                        'ai_generation_attempts': attempts,
+                        'ai_generation_state': 'failed' if attempts >= AI_GENERATION_MAX_ATTEMPTS else 'pending',
+                    })
+                    failures.append(f"[{property_id}] {prop.name}: {error}")
+                    failure_count += 1
+            results.clear()
+            run.write({
+                'success_count': success_count,
+                'failure_count': failure_count,
+                'rate_limited_count': limiter.rate_limited,
+                'duration': time.monotonic() - started,
             })
+            if commit:
+                self.env.cr.commit()
+
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            for future in as_completed([executor.submit(generate, property_id) for property_id in jobs]):
+                results.append(future.result())
+                if len(results) >= chunk_size:
+                    flush()
+        flush()
+
+        run.write({
+            'state': 'done',
+            'date_end': fields.Datetime.now(),
+            'failure_log': '\n'.join(failures),
+        })
+        _logger.info(f"🤖 AI generation run {run.id}: {success_count}/{len(self)} generated, "
+                     f"{failure_count} failed in {run.duration:.1f}s")
+        return run
+
+    # -------------------- AI CONTENT QUEUE --------------------
+    def _enqueue_ai_generation(self, regenerate=False):
+        """Queue published properties for AI content generation.
+
+        Without ``regenerate`` only properties that have no AI content
+        yet are queued.
+        """
+        to_queue = self.filtered(lambda p: p.is_published and (regenerate or not p.ai_content_generated))
+        if not to_queue:
+            return to_queue
+        to_queue.write({'ai_generation_state': 'pending', 'ai_generation_attempts': 0})
+        cron = self.env.ref('real_estate_management.ir_cron_generate_ai_content', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+        return to_queue
+
+    def _is_ai_content_pending(self):
+        """True while the detail page should show placeholders for the AI sections"""
+        self.ensure_one()
+        return not self.ai_content_generated and self.ai_generation_state != 'failed'
 
-            _logger.info(f"✅ AI content saved for property: {self.name}")
-            return True
-
-        except Exception as e:
-            _logger.error(f"❌ Error: {e}")
-            return False
+    @api.model
+    def _cron_generate_ai_content(self):
+        """Generate AI content for one batch of queued properties"""
+        batch_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate.ai_generation_batch_size', AI_GENERATION_BATCH_SIZE))
+
+        properties = self.search(AI_GENERATION_QUEUE_DOMAIN, limit=batch_size, order='ai_generation_attempts, id')
+        if not properties:
+            return
+        properties._generate_ai_content_batch(origin='queue', commit=True)
+        # A full batch means more are probably waiting: run again right away
+        if len(properties) == batch_size:
+            self.env.ref('real_estate_management.ir_cron_generate_ai_content')._trigger()
 
     @api.model
     def get_city_investment_info(self, city_name):
-        """Generate city investment info using FREE Groq API"""
+        """City investment info, served from property.ai.cache"""
         if not city_name:
             return None
+        info = json.loads(self.env['property.ai.cache']._get_content('investment_info', city_name))
+        # The HTML was sanitized when it was generated
+        for key in CITY_INVESTMENT_HTML_KEYS:
+            info[key] = Markup(info.get(key) or '')
+        return info
 
-        # Check cache
-        cached = self.search([
-            ('last_city_processed', '=', city_name),
-            ('city_investment_generated', '=', True)
-        ], limit=1)
-
-        if cached:
-            _logger.info(f"✅ Found cached city data for {city_name}")
-            return {
-                'city': city_name,
-                'ai_investment_reasons': cached.city_investment_reasons or '',
-                'ai_growth_potential': cached.city_growth_potential or '',
-                'ai_infrastructure': cached.city_infrastructure or '',
-                'ai_market_trends': cached.city_market_trends or '',
-                'ai_content_generated': True,
-            }
-
-        # Get Groq API key
-        api_key = self.env['ir.config_parameter'].sudo().get_param('groq.api_key')
-
-        if not api_key:
-            _logger.error("❌ Groq API key not configured")
-            return {
-                'city': city_name,
-                'ai_investment_reasons': '<p>Please configure Groq API key to see investment data.</p>',
-                'ai_growth_potential': '<p>Get free API key from https://console.groq.com</p>',
-                'ai_infrastructure': '<p>Configuration needed.</p>',
-                'ai_market_trends': '<p>Configuration needed.</p>',
-                'ai_content_generated': False,
-            }
-
-        _logger.info(f"📝 Generating city investment data for: {city_name}")
+    @api.model
+    def _get_fallback_city_investment_info(self, city_name):
+        """Placeholder shown until the city investment info is generated"""
+        return {
+            'city': city_name,
+            'ai_investment_reasons': f'<p>Investment insights for {city_name} are being prepared.</p>',
+            'ai_growth_potential': '<p>Please check back shortly.</p>',
+            'ai_infrastructure': '<p>Information not available yet.</p>',
+            'ai_market_trends': '<p>Information not available yet.</p>',
+            'ai_content_generated': False,
+        }
 
+    @api.model
+    def _get_city_investment_info_request(self, city_name):
+        """Keyword arguments of the LLM call generating the city investment info"""
         prompt = (
             f"Create real estate investment summary for {city_name}, India.\n\n"
             f"Return JSON with these keys (each as array of 2-3 bullet points):\n"
@@ -363,123 +946,122 @@ class Property(models.Model):
             f"- market_trends: Current property trends\n\n"
             f"Return ONLY valid JSON."
         )
-
-        headers = {
-            'Authorization': f'Bearer {api_key}',
-            'Content-Type': 'application/json'
-        }
-
-        payload = {
-            'model': 'llama-3.3-70b-versatile',
+        return {
             'messages': [
                 {'role': 'system', 'content': 'You are a real estate analyst. Return only JSON.'},
                 {'role': 'user', 'content': prompt}
             ],
             'max_tokens': 800,
-            'temperature': 0.3
+            'temperature': 0.3,
+            'caller': 'city_info',
         }
 
+    @api.model
+    def _generate_city_investment_info(self, city_name):
+        """Generate city investment info using FREE Groq API, None if the call failed"""
+        _logger.info(f"📝 Generating city investment data for: {city_name}")
         try:
-            _logger.info("📤 Calling Groq API for city data...")
-
-            response = requests.post(
-                'https://api.groq.com/openai/v1/chat/completions',
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-
-            if response.status_code != 200:
-                _logger.error(f"API Error: {response.text}")
-                return None
-
-            response_data = response.json()
-            response_text = response_data['choices'][0]['message']['content'].strip()
-
-            # Clean JSON
-            if response_text.startswith('```'):
-                lines = response_text.split('\n')
-                response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
+            # No response cache: property.ai.cache already holds the result
+            # for its TTL, and a refresh must reach the provider.
+            city_data = self.env['property.llm.client']._chat_json(**self._get_city_investment_info_request(city_name))
+            _logger.info(f"✅ Parsed city data with keys: {list(city_data.keys())}")
+        except LLMError as e:
+            _logger.error(f"❌ City investment generation failed for {city_name}: {e}")
+            return None
+        return self._get_city_investment_info_vals(city_name, city_data)
 
-            try:
-                city_data = json.loads(response_text)
-                _logger.info(f"✅ Parsed city data with keys: {list(city_data.keys())}")
-            except json.JSONDecodeError as e:
-                _logger.error(f"JSON parse error: {e}")
-                return None
-
-            # Convert to HTML
-            def to_html(data):
-                if not data:
-                    return '<p>Information not available.</p>'
-                if isinstance(data, list):
-                    items = ''.join([f'<li>{item}</li>' for item in data])
-                    return f'<ul>{items}</ul>'
-                if isinstance(data, str):
-                    return f'<p>{data}</p>'
+    @api.model
+    def _get_city_investment_info_vals(self, city_name, city_data):
+        """Turn the parsed LLM answer into the sanitized HTML sections of the city info"""
+        def to_html(data):
+            if not data:
                 return '<p>Information not available.</p>'
+            if isinstance(data, list):
+                items = ''.join([f'<li>{item}</li>' for item in data])
+                return f'<ul>{items}</ul>'
+            if isinstance(data, str):
+                return f'<p>{data}</p>'
+            return '<p>Information not available.</p>'
+
+        return {
+            'city': city_name,
+            'ai_investment_reasons': html_sanitize(to_html(city_data.get('investment_reasons', ''))),
+            'ai_growth_potential': html_sanitize(to_html(city_data.get('growth_potential', ''))),
+            'ai_infrastructure': html_sanitize(to_html(city_data.get('infrastructure', ''))),
+            'ai_market_trends': html_sanitize(to_html(city_data.get('market_trends', ''))),
+            'ai_content_generated': True,
+        }
 
-            investment_reasons = to_html(city_data.get('investment_reasons', ''))
-            growth_potential = to_html(city_data.get('growth_potential', ''))
-            infrastructure = to_html(city_data.get('infrastructure', ''))
-            market_trends = to_html(city_data.get('market_trends', ''))
-
-            # Cache the data
-            city_property = self.search([
-                ('city', '=', city_name),
-                ('is_published', '=', True)
-            ], limit=1)
-
-            if city_property:
-                city_property.write({
-                    'city_investment_reasons': investment_reasons,
-                    'city_growth_potential': growth_potential,
-                    'city_infrastructure': infrastructure,
-                    'city_market_trends': market_trends,
-                    'city_investment_generated': True,
-                    'city_investment_date': fields.Datetime.now(),
-                    'last_city_processed': city_name,
-                })
-                _logger.info(f"✅ Cached city data in property ID: {city_property.id}")
-
+    def action_force_geocode(self):
+        """Button to geocode again right away, ignoring cached results"""
+        located = 0
+        for rec in self:
+            # Failures fall back to the regular retry schedule of the queue
+            rec.write({'geocode_state': 'pending', 'geocode_attempts': 0, 'geocode_next_try': False})
+            if rec._geocode_now(force=True):
+                located += 1
+        if located == len(self):
             return {
-                'city': city_name,
-                'ai_investment_reasons': investment_reasons,
-                'ai_growth_potential': growth_potential,
-                'ai_infrastructure': infrastructure,
-                'ai_market_trends': market_trends,
-                'ai_content_generated': True,
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': 'Success',
+                    'message': 'Property location updated successfully!',
+                    'type': 'success',
+                    'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+                }
+            }
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Error',
+                'message': f'Could not geocode {len(self) - located} of {len(self)} properties. Check the address.',
+                'type': 'danger',
             }
+        }
 
-        except Exception as e:
-            _logger.error(f"❌ Error: {e}")
-            return None
+    def action_refresh_city_investment_info(self):
+        """Button to regenerate the cached investment info of the property cities"""
+        Cache = self.env['property.ai.cache'].sudo()
+        cities = [city for city in set(self.mapped('city')) if city]
+        for city in cities:
+            # Seeds the entry when the city has never been requested
+            Cache._get_content('investment_info', city)
+        Cache.search([('cache_type', '=', 'investment_info'), ('city', 'in', cities)])._refresh(force=True)
 
     def action_regenerate_ai_content(self):
-        """Button to regenerate AI content"""
-        for rec in self:
-            success = rec.generate_ai_content()
-            if success:
-                return {
-                    'type': 'ir.actions.client',
-                    'tag': 'display_notification',
-                    'params': {
-                        'title': 'Success',
-                        'message': 'AI content regenerated successfully!',
-                        'type': 'success',
-                    }
-                }
-            else:
-                return {
-                    'type': 'ir.actions.client',
-                    'tag': 'display_notification',
-                    'params': {
-                        'title': 'Error',
-                        'message': 'Failed to generate AI content. Check logs.',
-                        'type': 'danger',
-                    }
-                }
+        """Button to regenerate AI content of every selected property.
+
+        Small selections are generated during the request, larger ones
+        are queued for the generation cron.
+        """
+        inline_limit = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate.ai_generation_inline_limit', AI_GENERATION_INLINE_LIMIT))
+        if len(self) <= inline_limit:
+            run = self._generate_ai_content_batch()
+            return run._get_notification_action()
+        return self._get_ai_generation_queued_action(self._enqueue_ai_generation(regenerate=True))
+
+    @api.model
+    def action_generate_missing_ai_content(self):
+        """Queue AI content generation for every published property that has none"""
+        properties = self.search([('is_published', '=', True), ('ai_content_generated', '=', False)])
+        return self._get_ai_generation_queued_action(properties._enqueue_ai_generation())
+
+    @api.model
+    def _get_ai_generation_queued_action(self, queued):
+        """Client action telling how many properties were queued"""
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('AI Content Queued'),
+                'message': _('%s properties queued, their AI content is generated in the background.') % len(queued),
+                'type': 'info',
+                'sticky': False,
+            }
+        }
 
         # ⭐ ADD THIS COMPUTE METHOD (add after your other compute methods)
 
@@ -531,7 +1113,10 @@ class Property(models.Model):
     @api.model
     def get_daily_investment_news(self, city_name):
         """
-        Fetch AI-generated daily investment news for a specific city
+        Get the daily investment news for a specific city
+
+        Served from property.ai.cache, which regenerates it in the
+        background once it expires.
 
         Args:
             city_name (str): Name of the city
@@ -541,22 +1126,11 @@ class Property(models.Model):
         """
         if not city_name:
             return ""
+        return self.env['property.ai.cache']._get_content('daily_news', city_name)
 
-        try:
-            groq_api_key2 = self.env['ir.config_parameter'].sudo().get_param('groq_api_key2', '')
-
-            if not groq_api_key2:
-                _logger.warning(f"Groq API key not configured for city: {city_name}")
-                return self._get_fallback_city_news(city_name)
-
-            url = "https://api.groq.com/openai/v1/chat/completions"
-
-            headers = {
-                "Authorization": f"Bearer {groq_api_key2}",
-                "Content-Type": "application/json"
-            }
-
-            prompt = f"""You are a real estate investment expert. Generate a concise, engaging news ticker text (max 200 words) about top investment opportunities in {city_name}, India.
+    def _get_daily_investment_news_request(self, city_name):
+        """Keyword arguments of the LLM call generating the daily news of ``city_name``"""
+        prompt = f"""You are a real estate investment expert. Generate a concise, engaging news ticker text (max 200 words) about top investment opportunities in {city_name}, India.
 
     Format as a flowing news ticker with separators (|) between points. Include:
     - Top 3-4 investment hotspots/areas in {city_name}
@@ -568,41 +1142,41 @@ class Property(models.Model):
 
     Keep it engaging, data-driven, and ticker-friendly with emojis."""
 
-            payload = {
-                "model": "llama-3.3-70b-versatile",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a real estate market analyst providing investment insights for property investors."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.7,
-                "max_tokens": 300,
-                "top_p": 1
-            }
-
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
+        return {
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "You are a real estate market analyst providing investment insights for property investors."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'api_key_param': 'groq_api_key2',
+            'max_tokens': 300,
+            'temperature': 0.7,
+            'top_p': 1,
+            'caller': 'city_news',
+        }
 
-            if response.status_code == 200:
-                data = response.json()
-                ai_text = data['choices'][0]['message']['content'].strip()
-                _logger.info(f"✅ AI News generated for {city_name}: {ai_text[:100]}...")
-                return ai_text
-            else:
-                _logger.error(f"Groq API Error for {city_name}: {response.status_code}")
-                return self._get_fallback_city_news(city_name)
+    def _generate_daily_investment_news(self, city_name):
+        """
+        Fetch AI-generated daily investment news for a specific city
 
-        except requests.exceptions.Timeout:
-            _logger.error(f"Groq API timeout for {city_name}")
-            return self._get_fallback_city_news(city_name)
+        Args:
+            city_name (str): Name of the city
 
-        except Exception as e:
+        Returns:
+            str: Investment news text for the ticker, None if the call failed
+        """
+        try:
+            ai_text = self.env['property.llm.client']._chat(**self._get_daily_investment_news_request(city_name))
+        except LLMError as e:
             _logger.error(f"Error fetching AI news for {city_name}: {e}")
-            return self._get_fallback_city_news(city_name)
+            return None
+        _logger.info(f"✅ AI News generated for {city_name}: {ai_text[:100]}...")
+        return ai_text
 
     def _get_fallback_city_news(self, city_name):
         """Fallback static news if AI fails"""
@@ -623,27 +1197,18 @@ class Property(models.Model):
     @api.model
     def get_trending_investment_news(self):
         """
-        Fetch AI-generated trending investment markets across India
+        Get the trending investment markets across India
         Called when no city is selected (All Cities view)
 
         Returns:
             str: Trending investment markets text
         """
-        try:
-            groq_api_key2 = self.env['ir.config_parameter'].sudo().get_param('groq_api_key2', '')
-
-            if not groq_api_key2:
-                _logger.warning("Groq API key not configured for trending news")
-                return self._get_fallback_trending_news()
+        return self.env['property.ai.cache']._get_content('trending_news', TRENDING_NEWS_KEY)
 
-            url = "https://api.groq.com/openai/v1/chat/completions"
-
-            headers = {
-                "Authorization": f"Bearer {groq_api_key2}",
-                "Content-Type": "application/json"
-            }
-
-            prompt = """You are a real estate investment expert. Generate a concise overview (max 250 words) of the TOP 5 TRENDING real estate investment markets in India right now.
+    @api.model
+    def _get_trending_investment_news_request(self):
+        """Keyword arguments of the LLM call generating the trending news"""
+        prompt = """You are a real estate investment expert. Generate a concise overview (max 250 words) of the TOP 5 TRENDING real estate investment markets in India right now.
 
     Format as flowing text highlighting:
     - The 5 hottest cities/regions for real estate investment
@@ -657,41 +1222,39 @@ class Property(models.Model):
 
     Keep it concise, engaging, and ticker-friendly."""
 
-            payload = {
-                "model": "llama-3.3-70b-versatile",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a real estate market analyst providing trending investment insights across India."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.7,
-                "max_tokens": 400,
-                "top_p": 1
-            }
-
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                ai_text = data['choices'][0]['message']['content'].strip()
-                _logger.info(f"✅ Trending news generated: {ai_text[:100]}...")
-                return ai_text
-            else:
-                _logger.error(f"Groq API Error for trending: {response.status_code}")
-                return self._get_fallback_trending_news()
+        return {
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "You are a real estate market analyst providing trending investment insights across India."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'api_key_param': 'groq_api_key2',
+            'max_tokens': 400,
+            'temperature': 0.7,
+            'top_p': 1,
+            'caller': 'trending_news',
+        }
 
-        except requests.exceptions.Timeout:
-            _logger.error("Groq API timeout for trending news")
-            return self._get_fallback_trending_news()
+    @api.model
+    def _generate_trending_investment_news(self):
+        """
+        Fetch AI-generated trending investment markets across India
 
-        except Exception as e:
+        Returns:
+            str: Trending investment markets text, None if the call failed
+        """
+        try:
+            ai_text = self.env['property.llm.client']._chat(**self._get_trending_investment_news_request())
+        except LLMError as e:
             _logger.error(f"Error fetching trending news: {e}")
-            return self._get_fallback_trending_news()
+            return None
+        _logger.info(f"✅ Trending news generated: {ai_text[:100]}...")
+        return ai_text
 
     def _get_fallback_trending_news(self):
         """Fallback static trending news if AI fails"""
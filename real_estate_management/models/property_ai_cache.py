@@ -1,6 +1,68 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
 from odoo import models, fields, api
 
+from .llm_client import LLMError, parse_json_answer
+
+_logger = logging.getLogger(__name__)
+
+# Cache key used for the India-wide trending news (no city selected)
+TRENDING_NEWS_KEY = 'All Cities'
+
+# Defaults, overridable with the real_estate.ai_cache_* config params
+AI_CACHE_TTL_HOURS = {
+    'daily_news': 24,
+    'trending_news': 24,
+    'investment_info': 24 * 7,
+}
+AI_CACHE_RETRY_MINUTES = 15
+AI_CACHE_MAX_ENTRIES = 500
+AI_CACHE_WARMUP_CONCURRENCY = 3
+# The nightly warm-up regenerates entries expiring before its next run
+AI_CACHE_WARMUP_HORIZON = timedelta(days=1)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls sharing a key within this process.
+
+    The first caller of a key runs the function; callers arriving while
+    it is in flight wait for it (up to ``timeout``) and share its result.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func, timeout=None):
+        """Return ``(result, leader)``, ``leader`` telling whether this caller ran ``func``"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = {'event': threading.Event(), 'result': None}
+        if not leader:
+            call['event'].wait(timeout)
+            return call['result'], False
+        try:
+            call['result'] = func()
+            return call['result'], True
+        finally:
+            call['event'].set()
+            with self.lock:
+                del self.calls[key]
+
+
+# Refreshes in flight in this process, keyed by (database, cache type, city)
+_single_flight = SingleFlight()
+# How long a refresh waits for an identical one already running in this process
+AI_CACHE_SINGLE_FLIGHT_TIMEOUT = 60
+
 
 class PropertyAICache(models.Model):
     _name = 'property.ai.cache'
@@ -10,12 +72,339 @@ class PropertyAICache(models.Model):
     city = fields.Char(string='City', required=True, index=True)
     cache_type = fields.Selection([
         ('daily_news', 'Daily News Ticker'),
+        ('trending_news', 'Trending News Ticker'),
         ('investment_info', 'Investment Information'),
     ], string='Cache Type', required=True, index=True)
     content = fields.Text(string='Cached Content', required=True)
     create_date = fields.Datetime(string='Cache Date', default=fields.Datetime.now)
+    expires_at = fields.Datetime(string='Expires At', index=True)
+    is_fallback = fields.Boolean(string='Fallback Content',
+                                 help="Static placeholder served until the first successful generation.")
+    refresh_requested = fields.Boolean(string='Refresh Requested', index=True,
+                                       help="Set when a stale entry was served; the refresh cron regenerates it.")
 
     _sql_constraints = [
         ('unique_city_type', 'unique(city, cache_type)',
          'Cache entry already exists for this city and type!')
     ]
+
+    # -------------------- GENERATION --------------------
+    # Content is stored as text; investment_info is a JSON-encoded dict.
+    def _get_generator(self, cache_type, city):
+        """Return a callable producing fresh content, or None when generation fails"""
+        Property = self.env['property.property'].sudo()
+        if cache_type == 'daily_news':
+            return lambda: Property._generate_daily_investment_news(city)
+        if cache_type == 'trending_news':
+            return lambda: Property._generate_trending_investment_news()
+        if cache_type == 'investment_info':
+            def generate():
+                info = Property._generate_city_investment_info(city)
+                return info and json.dumps(info)
+            return generate
+        raise ValueError(f"Unknown AI cache type: {cache_type}")
+
+    def _get_fallback(self, cache_type, city):
+        Property = self.env['property.property'].sudo()
+        if cache_type == 'daily_news':
+            return Property._get_fallback_city_news(city)
+        if cache_type == 'trending_news':
+            return Property._get_fallback_trending_news()
+        if cache_type == 'investment_info':
+            return json.dumps(Property._get_fallback_city_investment_info(city))
+        raise ValueError(f"Unknown AI cache type: {cache_type}")
+
+    @api.model
+    def _get_ttl(self, cache_type):
+        ICP = self.env['ir.config_parameter'].sudo()
+        hours = ICP.get_param(f'real_estate.ai_cache_ttl_hours.{cache_type}', AI_CACHE_TTL_HOURS[cache_type])
+        return timedelta(hours=float(hours))
+
+    # -------------------- LOOKUP --------------------
+    @api.model
+    def _get_content(self, cache_type, city):
+        """Return the cached content for ``city``, stale-while-revalidate.
+
+        Page views never wait on the LLM: a missing entry is seeded with
+        the fallback text and an expired one is served as is, and in both
+        cases the refresh cron is woken up to regenerate it.
+        """
+        return self._lookup(cache_type, city)[0]
+
+    @api.model
+    def _lookup(self, cache_type, city):
+        """Like ``_get_content`` but return ``(content, is_fallback)``"""
+        if self._is_caching_disabled():
+            content = self._get_generator(cache_type, city)()
+            return (content, False) if content else (self._get_fallback(cache_type, city), True)
+
+        Cache = self.sudo()
+        entry = Cache.search([('cache_type', '=', cache_type), ('city', '=', city)], limit=1)
+        if not entry:
+            content = self._get_fallback(cache_type, city)
+            # ON CONFLICT: concurrent visitors of a new city seed it only once
+            self.env.cr.execute("""
+                INSERT INTO property_ai_cache (city, cache_type, content, is_fallback, refresh_requested,
+                                               expires_at, create_date, write_date)
+                VALUES (%s, %s, %s, TRUE, TRUE, now() at time zone 'UTC',
+                        now() at time zone 'UTC', now() at time zone 'UTC')
+                ON CONFLICT (city, cache_type) DO NOTHING
+            """, [city, cache_type, content])
+            if self.env.cr.rowcount:
+                self._trigger_refresh()
+            return content, True
+
+        if entry.expires_at and entry.expires_at <= fields.Datetime.now() and not entry.refresh_requested:
+            # Only the first visitor after expiry flags the entry
+            self.env.cr.execute(
+                "UPDATE property_ai_cache SET refresh_requested = TRUE WHERE id = %s AND refresh_requested IS NOT TRUE",
+                [entry.id])
+            if self.env.cr.rowcount:
+                self._trigger_refresh()
+        return entry.content, entry.is_fallback
+
+    @api.model
+    def _is_caching_disabled(self):
+        """Whether ``real_estate.disable_caches`` is set.
+
+        Meant for benchmarks only: AI content is then generated during the
+        request, as without this cache, the public page and news caches of
+        the website controller are bypassed and LLM answers are not read
+        from or written to property.llm.response.cache.
+        """
+        return bool(self.env['ir.config_parameter'].sudo().get_param('real_estate.disable_caches'))
+
+    @api.model
+    def _trigger_refresh(self):
+        cron = self.env.ref('real_estate_management.ir_cron_refresh_ai_cache', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+
+    # -------------------- REFRESH --------------------
+    @api.model
+    def _get_lock_key(self, cache_type, city):
+        """64-bit key of the PostgreSQL advisory lock guarding one cache entry"""
+        digest = hashlib.sha1(f'property.ai.cache:{cache_type}:{city}'.encode()).digest()
+        return int.from_bytes(digest[:8], 'big', signed=True)
+
+    def _refresh(self, force=False, fresh_until=None):
+        """Regenerate the content of ``self``; keep the old text if generation fails.
+
+        Only one generation per entry runs at a time: concurrent threads of
+        this process wait for the one in flight, and other workers skip the
+        entry while its advisory lock is held, leaving the stale value in
+        place. Without ``force``, entries found fresh once the lock is
+        acquired (valid past ``fresh_until``, by default now) are not
+        generated again.
+        """
+        for entry in self:
+            key = (self.env.cr.dbname, entry.cache_type, entry.city)
+            _content, leader = _single_flight.do(
+                key, lambda: entry._refresh_locked(force=force, fresh_until=fresh_until),
+                timeout=AI_CACHE_SINGLE_FLIGHT_TIMEOUT)
+            if not leader:
+                _logger.info(f"AI cache: {entry.cache_type} for {entry.city} already refreshing in this worker")
+
+    def _refresh_locked(self, force=False, fresh_until=None):
+        """Regenerate ``self`` under its advisory lock; return the current content, None if skipped"""
+        self.ensure_one()
+        self.env.cr.execute("SELECT pg_try_advisory_xact_lock(%s)", [self._get_lock_key(self.cache_type, self.city)])
+        if not self.env.cr.fetchone()[0]:
+            _logger.info(f"AI cache: {self.cache_type} for {self.city} already refreshing in another worker")
+            return None
+        # Another worker may have refreshed it while we were waiting for the lock
+        self.invalidate_recordset(['content', 'expires_at', 'refresh_requested'])
+        if not force and self._is_fresh(fresh_until):
+            return self.content
+
+        content = self._get_generator(self.cache_type, self.city)()
+        if content:
+            self._store_content(content)
+        else:
+            self._store_failure()
+        return self.content
+
+    def _store_content(self, content):
+        self.ensure_one()
+        self.write({
+            'content': content,
+            'is_fallback': False,
+            'expires_at': fields.Datetime.now() + self._get_ttl(self.cache_type),
+            'refresh_requested': False,
+        })
+        _logger.info(f"✅ AI cache refreshed: {self.cache_type} for {self.city}")
+        if self.cache_type == 'investment_info':
+            # Rendered into the cached public map page; the version bump runs
+            # on commit, so it also reaches the other workers from a thread.
+            self.env['property.property']._invalidate_public_caches()
+
+    def _store_failure(self):
+        """Keep the stale content and try again after the retry delay"""
+        self.ensure_one()
+        retry = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate.ai_cache_retry_minutes', AI_CACHE_RETRY_MINUTES))
+        self.write({
+            'expires_at': fields.Datetime.now() + timedelta(minutes=retry),
+            'refresh_requested': False,
+        })
+        _logger.warning(f"AI cache refresh failed: {self.cache_type} for {self.city}, keeping stale content")
+
+    def _is_fresh(self, fresh_until=None):
+        self.ensure_one()
+        fresh_until = fresh_until or fields.Datetime.now()
+        return not self.is_fallback and not self.refresh_requested \
+            and bool(self.expires_at) and self.expires_at > fresh_until
+
+    def action_refresh(self):
+        """Button to regenerate the selected entries right away"""
+        self._refresh(force=True)
+
+    @api.model
+    def _cron_refresh(self):
+        """Regenerate entries flagged by visitors, then enforce the size cap"""
+        for entry in self.search([('refresh_requested', '=', True)], order='expires_at, id'):
+            entry._refresh()
+            self.env.cr.commit()
+        self._evict()
+
+    @api.model
+    def _evict(self):
+        """Keep at most ``real_estate.ai_cache_max_entries`` entries per type, newest first"""
+        max_entries = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate.ai_cache_max_entries', AI_CACHE_MAX_ENTRIES))
+        self.env.cr.execute("""
+            DELETE FROM property_ai_cache
+             WHERE id IN (SELECT id FROM (
+                    SELECT id, row_number() OVER (PARTITION BY cache_type ORDER BY write_date DESC, id DESC) AS rank
+                      FROM property_ai_cache) ranked
+                    WHERE rank > %s)
+        """, [max_entries])
+        if self.env.cr.rowcount:
+            _logger.info(f"AI cache: evicted {self.env.cr.rowcount} old entries")
+
+    # -------------------- STREAMING --------------------
+    @api.model
+    def _get_stream_request(self, cache_type, city):
+        """Keyword arguments of the streaming LLM call generating an entry"""
+        Property = self.env['property.property'].sudo()
+        if cache_type == 'daily_news':
+            return Property._get_daily_investment_news_request(city)
+        if cache_type == 'trending_news':
+            return Property._get_trending_investment_news_request()
+        if cache_type == 'investment_info':
+            return Property._get_city_investment_info_request(city)
+        raise ValueError(f"Unknown AI cache type: {cache_type}")
+
+    @api.model
+    def _get_streamed_content(self, cache_type, city, text):
+        """Content to store for a complete streamed answer, None if it is unusable"""
+        text = text.strip()
+        if cache_type != 'investment_info':
+            return text or None
+        try:
+            city_data = parse_json_answer(text)
+        except LLMError as e:
+            _logger.error(f"❌ Streamed city investment info for {city} is not valid JSON: {e}")
+            return None
+        return json.dumps(self.env['property.property'].sudo()._get_city_investment_info_vals(city, city_data))
+
+    @api.model
+    def _stream(self, cache_type, city):
+        """Return an iterator of ``(event, data)`` generating the entry of ``city`` live.
+
+        'token' events carry the answer fragments as the LLM sends them and
+        the final 'done' event the content now in the cache. Fresh entries,
+        and entries being generated by someone else, get 'done' right away.
+        The iterator works in its own transaction, so that it can still be
+        consumed once the current one has ended, e.g. by a streamed HTTP
+        response.
+        """
+        content, _is_fallback = self._lookup(cache_type, city)
+        entry = self.sudo().search([('cache_type', '=', cache_type), ('city', '=', city)], limit=1)
+        if not entry or entry._is_fresh():
+            return iter([('done', content)])
+
+        chunks = self.env['property.llm.client']._chat_stream(**self._get_stream_request(cache_type, city))
+        registry, uid, context = self.env.registry, self.env.uid, self.env.context
+        entry_id, lock_key = entry.id, self._get_lock_key(cache_type, city)
+
+        def generate():
+            with registry.cursor() as cr:
+                cr.execute("SELECT pg_try_advisory_xact_lock(%s)", [lock_key])
+                if not cr.fetchone()[0]:
+                    _logger.info(f"AI cache: {cache_type} for {city} already refreshing, not streaming")
+                    yield 'done', content
+                    return
+                Cache = api.Environment(cr, uid, context)['property.ai.cache'].sudo()
+                entry = Cache.browse(entry_id).exists()
+                if not entry or entry._is_fresh():
+                    # Refreshed, or evicted, since the request looked it up
+                    yield 'done', entry.content or content
+                    return
+                parts = []
+                try:
+                    for chunk in chunks:
+                        parts.append(chunk)
+                        yield 'token', chunk
+                except LLMError as e:
+                    _logger.error(f"AI cache: streaming {cache_type} for {city} failed: {e}")
+                new_content = Cache._get_streamed_content(cache_type, city, ''.join(parts))
+                if new_content:
+                    entry._store_content(new_content)
+                else:
+                    entry._store_failure()
+            yield 'done', new_content or content
+
+        return generate()
+
+    # -------------------- WARM-UP --------------------
+    @api.model
+    def _get_warmup_keys(self):
+        """(cache type, city) of every entry a visitor can request"""
+        keys = [('trending_news', TRENDING_NEWS_KEY)]
+        for city in self.env['property.property'].sudo()._get_city_list(published_only=True):
+            keys += [('investment_info', city), ('daily_news', city)]
+        return keys
+
+    @api.model
+    def _warm_up_entry(self, cache_type, city, fresh_until):
+        """Generate one entry in its own transaction (runs in a warm-up thread)"""
+        try:
+            with self.env.registry.cursor() as cr:
+                Cache = api.Environment(cr, self.env.uid, self.env.context)['property.ai.cache'].sudo()
+                entry = Cache.search([('cache_type', '=', cache_type), ('city', '=', city)], limit=1)
+                if not entry:
+                    entry = Cache.create({
+                        'city': city,
+                        'cache_type': cache_type,
+                        'content': Cache._get_fallback(cache_type, city),
+                        'is_fallback': True,
+                    })
+                entry._refresh(fresh_until=fresh_until)
+                return not entry.is_fallback
+        except Exception as e:
+            _logger.error(f"AI cache warm-up failed for {cache_type} of {city}: {e}")
+            return False
+
+    @api.model
+    def _cron_warm_up(self):
+        """Pre-generate the news tickers and investment info of every city with published listings.
+
+        Entries still valid at the next run are skipped, the others are
+        generated AI_CACHE_WARMUP_CONCURRENCY at a time so that visitors
+        never have to wait for the LLM.
+        """
+        concurrency = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate.ai_cache_warmup_concurrency', AI_CACHE_WARMUP_CONCURRENCY))
+        fresh_until = fields.Datetime.now() + AI_CACHE_WARMUP_HORIZON
+
+        entries = {(entry.cache_type, entry.city): entry for entry in self.sudo().search([])}
+        keys = [key for key in self._get_warmup_keys()
+                if key not in entries or not entries[key]._is_fresh(fresh_until)]
+        _logger.info(f"🔥 AI cache warm-up: {len(keys)} entries to generate")
+        if not keys:
+            return
+
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            results = list(executor.map(lambda key: self._warm_up_entry(*key, fresh_until), keys))
+        _logger.info(f"🔥 AI cache warm-up: {results.count(True)}/{len(keys)} entries generated")
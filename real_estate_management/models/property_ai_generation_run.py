@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+
+
+class PropertyAIGenerationRun(models.Model):
+    _name = 'property.ai.generation.run'
+    _description = 'AI Content Generation Run'
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', compute='_compute_name')
+    origin = fields.Selection([
+        ('manual', 'Selected Properties'),
+        ('queue', 'Generation Queue'),
+    ], string='Origin', required=True, default='manual', readonly=True)
+    state = fields.Selection([
+        ('running', 'Running'),
+        ('done', 'Done'),
+    ], string='Status', default='running', required=True, readonly=True)
+    user_id = fields.Many2one('res.users', string='Started By', default=lambda self: self.env.user, readonly=True)
+    date_start = fields.Datetime(string='Started On', default=fields.Datetime.now, readonly=True)
+    date_end = fields.Datetime(string='Finished On', readonly=True)
+    concurrency = fields.Integer(string='Max Concurrency', readonly=True)
+    total_count = fields.Integer(string='Properties', readonly=True)
+    success_count = fields.Integer(string='Generated', readonly=True)
+    failure_count = fields.Integer(string='Failed', readonly=True)
+    rate_limited_count = fields.Integer(string='Rate Limited Answers', readonly=True,
+                                        help="Number of 429 answers; each one halved the concurrency.")
+    duration = fields.Float(string='Elapsed Time (s)', readonly=True, digits=(16, 1))
+    throughput = fields.Float(string='Throughput (properties/min)', compute='_compute_throughput', digits=(16, 1))
+    failure_log = fields.Text(string='Failures', readonly=True)
+
+    @api.depends('origin', 'date_start')
+    def _compute_name(self):
+        origins = dict(self._fields['origin'].selection)
+        for run in self:
+            run.name = f"{origins.get(run.origin)} - {fields.Datetime.to_string(run.date_start)}"
+
+    @api.depends('success_count', 'failure_count', 'duration')
+    def _compute_throughput(self):
+        for run in self:
+            processed = run.success_count + run.failure_count
+            run.throughput = 60.0 * processed / run.duration if run.duration else 0.0
+
+    def _get_notification_action(self):
+        """Client action summarizing the run, for the buttons that start one"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Success' if not self.failure_count else 'Error',
+                'message': f'AI content generated for {self.success_count} of {self.total_count} properties '
+                           f'in {self.duration:.1f}s ({self.failure_count} failed).',
+                'type': 'success' if not self.failure_count else 'warning',
+                'sticky': bool(self.failure_count),
+            }
+        }
@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import models, fields, api
 
 
 class PropertyCategory(models.Model):
@@ -16,3 +16,21 @@ class PropertyCategory(models.Model):
     color = fields.Integer(string='Color', default=0)
 
     property_ids = fields.One2many('property.property', 'category_id', string='Properties')
+
+    # Category names and colours appear on the cached public map and
+    # listing pages, so any change invalidates those caches.
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super(PropertyCategory, self).create(vals_list)
+        self.env['property.property']._invalidate_public_caches()
+        return records
+
+    def write(self, vals):
+        res = super(PropertyCategory, self).write(vals)
+        self.env['property.property']._invalidate_public_caches()
+        return res
+
+    def unlink(self):
+        res = super(PropertyCategory, self).unlink()
+        self.env['property.property']._invalidate_public_caches()
+        return res
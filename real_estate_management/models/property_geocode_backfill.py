@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.osv import expression
+
+from .property import RateLimiter
+
+_logger = logging.getLogger(__name__)
+
+# Seconds a single cron run may spend before handing over to the next run
+BACKFILL_TIME_BUDGET = 240
+# Number of failures kept in the run report
+BACKFILL_FAILURE_LOG_SIZE = 200
+
+
+class PropertyGeocodeBackfill(models.Model):
+    _name = 'property.geocode.backfill'
+    _description = 'Property Geocoding Backfill'
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', required=True,
+                       default=lambda self: _('Backfill %s', fields.Datetime.now().strftime('%Y-%m-%d %H:%M')))
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('running', 'Running'),
+        ('paused', 'Paused'),
+        ('done', 'Done'),
+    ], string='Status', default='draft', required=True, readonly=True, copy=False)
+    scope = fields.Selection([
+        ('missing', 'Missing Coordinates'),
+        ('stale', 'Missing or Stale Coordinates'),
+        ('all', 'All Properties'),
+    ], string='Scope', default='missing', required=True)
+    stale_days = fields.Integer(string='Stale After (days)', default=180,
+                                help="With the 'stale' scope, properties geocoded before this many days ago are included.")
+    chunk_size = fields.Integer(string='Chunk Size', default=100, required=True,
+                                help="Properties processed between two commits.")
+    requests_per_second = fields.Float(string='Requests per Second', default=1.0, required=True,
+                                       help="Upper bound on the geocoding provider requests of this backfill, "
+                                            "within the shared real_estate.geocode_rate_limit. "
+                                            "0 leaves only the shared limit.")
+    use_cache = fields.Boolean(string='Use Geocode Cache', default=True,
+                               help="Uncheck after a provider change to ignore previously cached results.")
+
+    # Progress
+    last_id = fields.Integer(string='Cursor', readonly=True, copy=False,
+                             help="Id of the last processed property; the run resumes after it.")
+    total_count = fields.Integer(string='Properties in Scope', readonly=True, copy=False)
+    processed_count = fields.Integer(string='Processed', readonly=True, copy=False)
+    located_count = fields.Integer(string='Located', readonly=True, copy=False)
+    failed_count = fields.Integer(string='Failed', readonly=True, copy=False)
+    chunk_count = fields.Integer(string='Chunks', readonly=True, copy=False)
+    duration = fields.Float(string='Processing Time (s)', readonly=True, copy=False)
+    throughput = fields.Float(string='Throughput (properties/s)', compute='_compute_throughput', digits=(16, 2))
+    progress = fields.Float(string='Progress', compute='_compute_throughput')
+    date_start = fields.Datetime(string='Started On', readonly=True, copy=False)
+    date_end = fields.Datetime(string='Finished On', readonly=True, copy=False)
+    failure_log = fields.Text(string='Failures', readonly=True, copy=False)
+
+    _sql_constraints = [
+        ('chunk_size_positive', 'CHECK(chunk_size > 0)', 'The chunk size must be positive.'),
+        ('requests_per_second_positive', 'CHECK(requests_per_second >= 0)',
+         'The requests per second budget cannot be negative.'),
+    ]
+
+    @api.depends('processed_count', 'duration', 'total_count')
+    def _compute_throughput(self):
+        for rec in self:
+            rec.throughput = rec.processed_count / rec.duration if rec.duration else 0.0
+            rec.progress = 100.0 * rec.processed_count / rec.total_count if rec.total_count else 0.0
+
+    # -------------------- SCOPE --------------------
+    def _get_property_domain(self):
+        self.ensure_one()
+        if self.scope == 'all':
+            return []
+        domains = [
+            [('latitude', 'in', [False, 0.0])],
+            [('longitude', 'in', [False, 0.0])],
+            [('geocode_state', 'in', ['pending', 'failed'])],
+        ]
+        if self.scope == 'stale':
+            cutoff = fields.Date.context_today(self) - timedelta(days=self.stale_days)
+            domains += [[('date_localization', '=', False)], [('date_localization', '<', cutoff)]]
+        return expression.OR(domains)
+
+    # -------------------- ACTIONS --------------------
+    def action_start(self):
+        for rec in self:
+            if rec.state == 'done':
+                raise UserError(_("Backfill '%s' is already finished; duplicate it to run it again.", rec.name))
+            vals = {'state': 'running'}
+            if rec.state == 'draft':
+                vals.update({
+                    'date_start': fields.Datetime.now(),
+                    'total_count': self.env['property.property'].search_count(rec._get_property_domain()),
+                })
+            rec.write(vals)
+        self.env.ref('real_estate_management.ir_cron_geocode_backfill')._trigger()
+
+    def action_pause(self):
+        self.filtered(lambda r: r.state == 'running').write({'state': 'paused'})
+
+    # -------------------- PROCESSING --------------------
+    def _run_chunk(self, throttle):
+        """Geocode the next chunk after the cursor; return False once nothing is left"""
+        self.ensure_one()
+        Property = self.env['property.property']
+        properties = Property.search(
+            self._get_property_domain() + [('id', '>', self.last_id)], order='id', limit=self.chunk_size)
+        if not properties:
+            self.write({'state': 'done', 'date_end': fields.Datetime.now()})
+            return False
+
+        started = time.monotonic()
+        located, failures = 0, []
+        for prop in properties:
+            # Failures fall back to the regular retry schedule of the queue
+            prop.write({'geocode_state': 'pending', 'geocode_attempts': 0, 'geocode_next_try': False})
+            if prop._geocode_now(throttle=throttle, force=not self.use_cache):
+                located += 1
+            else:
+                failures.append(f"[{prop.id}] {prop.name}")
+
+        failure_log = '\n'.join(filter(None, [self.failure_log] + failures)).splitlines()
+        self.write({
+            'last_id': properties[-1].id,
+            'processed_count': self.processed_count + len(properties),
+            'located_count': self.located_count + located,
+            'failed_count': self.failed_count + len(failures),
+            'chunk_count': self.chunk_count + 1,
+            'duration': self.duration + time.monotonic() - started,
+            'failure_log': '\n'.join(failure_log[-BACKFILL_FAILURE_LOG_SIZE:]),
+        })
+        _logger.info(f"🗺️ {self.name}: chunk {self.chunk_count} done, {self.processed_count}/{self.total_count} "
+                     f"processed, {self.failed_count} failed, {self.throughput:.2f} properties/s")
+        return True
+
+    @api.model
+    def _cron_process(self):
+        """Advance running backfills chunk by chunk, committing after each chunk"""
+        deadline = time.monotonic() + BACKFILL_TIME_BUDGET
+        for backfill in self.search([('state', '=', 'running')], order='id'):
+            # Also waits on the shared limiter, next to the geocoding queue
+            throttle = RateLimiter(backfill.requests_per_second,
+                                   parent=self.env['property.property']._get_geocode_throttle())
+            while time.monotonic() < deadline:
+                has_more = backfill._run_chunk(throttle)
+                self.env.cr.commit()
+                # Pick up pauses requested while the chunk was running
+                backfill.invalidate_recordset(['state'])
+                if not has_more or backfill.state != 'running':
+                    break
+            if time.monotonic() >= deadline:
+                self.env.ref('real_estate_management.ir_cron_geocode_backfill')._trigger()
+                break
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import logging
+import re
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Defaults, overridable with the real_estate.geocode_cache_* config params
+GEOCODE_CACHE_TTL_DAYS = 180
+GEOCODE_CACHE_NEGATIVE_TTL_DAYS = 7
+GEOCODE_CACHE_MAX_ENTRIES = 20000
+
+GEOCODE_ADDRESS_KEYS = ('street', 'zip', 'city', 'state', 'country')
+
+
+class PropertyGeocodeCache(models.Model):
+    _name = 'property.geocode.cache'
+    _description = 'Geocoding Result Cache'
+    _rec_name = 'address'
+    _order = 'last_used desc, id desc'
+
+    fingerprint = fields.Char(string='Fingerprint', required=True, index=True, readonly=True)
+    address = fields.Char(string='Normalized Address', readonly=True)
+    found = fields.Boolean(string='Found', readonly=True,
+                           help="Unchecked when the provider returned no result for this address.")
+    latitude = fields.Float(string='Latitude', digits=(16, 5), readonly=True)
+    longitude = fields.Float(string='Longitude', digits=(16, 5), readonly=True)
+    provider = fields.Char(string='Provider', readonly=True)
+    geocode_date = fields.Datetime(string='Geocoded On', required=True, readonly=True,
+                                   default=fields.Datetime.now)
+    last_used = fields.Datetime(string='Last Used', readonly=True, default=fields.Datetime.now, index=True)
+    hit_count = fields.Integer(string='Hits', readonly=True, default=0)
+
+    _sql_constraints = [
+        ('fingerprint_unique', 'unique(fingerprint)',
+         'A geocoding result is already cached for this address!')
+    ]
+
+    # -------------------- KEYS --------------------
+    @api.model
+    def _normalize_address(self, address_components):
+        """Canonical text form of a structured address.
+
+        Case, punctuation and repeated whitespace are ignored so that
+        trivially different spellings of one address share a cache entry.
+        """
+        parts = []
+        for key in GEOCODE_ADDRESS_KEYS:
+            value = (address_components.get(key) or '').lower()
+            value = re.sub(r'[^\w\s]', ' ', value)
+            parts.append(' '.join(value.split()))
+        return '|'.join(parts)
+
+    @api.model
+    def _get_fingerprint(self, address_components):
+        return hashlib.sha1(self._normalize_address(address_components).encode()).hexdigest()
+
+    # -------------------- LOOKUP --------------------
+    def _is_fresh(self):
+        self.ensure_one()
+        ICP = self.env['ir.config_parameter'].sudo()
+        if self.found:
+            ttl = int(ICP.get_param('real_estate.geocode_cache_ttl_days', GEOCODE_CACHE_TTL_DAYS))
+        else:
+            ttl = int(ICP.get_param('real_estate.geocode_cache_negative_ttl_days', GEOCODE_CACHE_NEGATIVE_TTL_DAYS))
+        return self.geocode_date >= fields.Datetime.now() - timedelta(days=ttl)
+
+    @api.model
+    def _lookup(self, address_components):
+        """Return the fresh cache entry for ``address_components``, if any"""
+        entry = self.sudo().search([('fingerprint', '=', self._get_fingerprint(address_components))], limit=1)
+        if not entry or not entry._is_fresh():
+            return self.browse()
+        # Plain SQL keeps hits cheap and free of write side effects
+        self.env.cr.execute(
+            "UPDATE property_geocode_cache SET hit_count = COALESCE(hit_count, 0) + 1, last_used = now() at time zone 'UTC'"
+            " WHERE id = %s", [entry.id])
+        return entry
+
+    @api.model
+    def _store(self, address_components, coords, provider=None):
+        """Record the geocoding outcome (``coords`` may be None for a miss)"""
+        fingerprint = self._get_fingerprint(address_components)
+        now = fields.Datetime.now()
+        vals = {
+            'address': self._normalize_address(address_components),
+            'found': bool(coords),
+            'latitude': coords[0] if coords else 0.0,
+            'longitude': coords[1] if coords else 0.0,
+            'provider': provider,
+            'geocode_date': now,
+            'last_used': now,
+        }
+        Cache = self.sudo()
+        entry = Cache.search([('fingerprint', '=', fingerprint)], limit=1)
+        if entry:
+            entry.write(vals)
+        else:
+            entry = Cache.create(dict(vals, fingerprint=fingerprint))
+        return entry
+
+    def _get_coords(self):
+        self.ensure_one()
+        return (self.latitude, self.longitude) if self.found else None
+
+    # -------------------- EVICTION --------------------
+    @api.model
+    def _cron_evict(self):
+        """Drop expired entries, then the least recently used ones above the size cap"""
+        ICP = self.env['ir.config_parameter'].sudo()
+        ttl = int(ICP.get_param('real_estate.geocode_cache_ttl_days', GEOCODE_CACHE_TTL_DAYS))
+        negative_ttl = int(ICP.get_param('real_estate.geocode_cache_negative_ttl_days',
+                                         GEOCODE_CACHE_NEGATIVE_TTL_DAYS))
+        max_entries = int(ICP.get_param('real_estate.geocode_cache_max_entries', GEOCODE_CACHE_MAX_ENTRIES))
+        now = fields.Datetime.now()
+
+        self.env.cr.execute("""
+            DELETE FROM property_geocode_cache
+             WHERE (found IS TRUE AND geocode_date < %s)
+                OR (found IS NOT TRUE AND geocode_date < %s)
+        """, [now - timedelta(days=ttl), now - timedelta(days=negative_ttl)])
+        expired = self.env.cr.rowcount
+
+        self.env.cr.execute("""
+            DELETE FROM property_geocode_cache
+             WHERE id IN (SELECT id FROM property_geocode_cache
+                           ORDER BY last_used DESC, id DESC
+                          OFFSET %s)
+        """, [max_entries])
+        evicted = self.env.cr.rowcount
+        _logger.info(f"🗺️ Geocode cache: removed {expired} expired and {evicted} least recently used entries")
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Hits folded into the property counters per transaction by the flush cron
+VIEW_FLUSH_BATCH_SIZE = 50000
+
+
+class PropertyViewHit(models.Model):
+    """Append-only log of property detail page views.
+
+    Page views only insert a row here, which never waits on other
+    visitors; the flush cron adds them to ``views`` / ``last_viewed`` of
+    property.property in batches. Kept narrow on purpose: no ORM
+    bookkeeping columns.
+    """
+    _name = 'property.view.hit'
+    _description = 'Property View Hit'
+    _log_access = False
+    _order = 'id'
+
+    property_id = fields.Many2one('property.property', string='Property', required=True, ondelete='cascade')
+    viewed_at = fields.Datetime(string='Viewed At', required=True, default=fields.Datetime.now)
+
+    @api.model
+    def _log_hit(self, property_id):
+        self.env.cr.execute("""
+            INSERT INTO property_view_hit (property_id, viewed_at)
+            VALUES (%s, now() at time zone 'UTC')
+        """, [property_id])
+
+    @api.model
+    def _cron_flush(self, batch_size=None):
+        """Fold logged hits into the property counters, committing after each batch"""
+        batch_size = batch_size or VIEW_FLUSH_BATCH_SIZE
+        total = 0
+        while True:
+            # A single statement: hits and counters cannot get out of step,
+            # and the property rows are not touched through the ORM (no
+            # write_date bump, no tracking).
+            self.env.cr.execute("""
+                WITH flushed AS (
+                    DELETE FROM property_view_hit
+                     WHERE id IN (SELECT id FROM property_view_hit ORDER BY id LIMIT %s)
+                 RETURNING property_id, viewed_at
+                ), counts AS (
+                    SELECT property_id, count(*) AS hits, max(viewed_at) AS last_viewed
+                      FROM flushed
+                  GROUP BY property_id
+                )
+                UPDATE property_property p
+                   SET views = COALESCE(p.views, 0) + c.hits,
+                       last_viewed = GREATEST(p.last_viewed, c.last_viewed)
+                  FROM counts c
+                 WHERE p.id = c.property_id
+             RETURNING c.hits
+            """, [batch_size])
+            hits = sum(row[0] for row in self.env.cr.fetchall())
+            total += hits
+            self.env['property.property'].invalidate_model(['views', 'last_viewed'])
+            self.env.cr.commit()
+            if hits < batch_size:
+                break
+        if total:
+            _logger.info(f"👁️ Property views: {total} hits flushed")
@@ -61,9 +61,9 @@
                 '<div style="overflow:hidden;background:rgba(0,0,0,0.22);border-radius:10px;border-left:5px solid #fbbf24;">' +
                     '<div style="display:inline-flex;align-items:center;white-space:nowrap;' +
                                'animation:_ai_scroll 50s linear infinite;padding:10px 0;">' +
-                        '<span style="padding:0 48px;color:#fff;font-size:15px;font-weight:500;line-height:1.6;">' + safe + '</span>' +
+                        '<span class="ai-ticker-text" style="padding:0 48px;color:#fff;font-size:15px;font-weight:500;line-height:1.6;">' + safe + '</span>' +
                         '<span style="color:#fbbf24;font-size:22px;padding:0 16px;">&#x25CF;</span>' +
-                        '<span style="padding:0 48px;color:#fff;font-size:15px;font-weight:500;line-height:1.6;">' + safe + '</span>' +
+                        '<span class="ai-ticker-text" style="padding:0 48px;color:#fff;font-size:15px;font-weight:500;line-height:1.6;">' + safe + '</span>' +
                         '<span style="color:#fbbf24;font-size:22px;padding:0 16px;">&#x25CF;</span>' +
                     '</div>' +
                 '</div>' +
@@ -81,20 +81,162 @@
         else                                     { document.body.insertBefore(wrapper, document.body.firstChild); }
     }
 
+    // News kept in sessionStorage is shown straight away; within
+    // TICKER_CACHE_TTL it is not even revalidated, after that the
+    // server only answers 304 when its ETag still matches.
+    var TICKER_CACHE_TTL = 5 * 60 * 1000;
+
+    function readTickerCache(city) {
+        try { return JSON.parse(window.sessionStorage.getItem('ai-news:' + city)); }
+        catch (e) { return null; }
+    }
+
+    function writeTickerCache(city, entry) {
+        try { window.sessionStorage.setItem('ai-news:' + city, JSON.stringify(entry)); }
+        catch (e) { /* storage full or disabled */ }
+    }
+
+    // Replace the ticker text in place, so that streamed updates do not
+    // restart the scrolling animation.
+    function updateTicker(newsText, city) {
+        var spans = document.querySelectorAll('#ai-news-ticker-box .ai-ticker-text');
+        if (!spans.length) { insertTicker(newsText, city); return; }
+        for (var i = 0; i < spans.length; i++) spans[i].textContent = newsText;
+    }
+
     function loadTicker() {
         var city = getCity();
+        var cached = readTickerCache(city);
+        if (cached && cached.news) {
+            insertTicker(cached.news, cached.city || '');
+            if (Date.now() - cached.at < TICKER_CACHE_TTL) return;
+        }
+
+        var headers = {};
+        if (cached && cached.etag) headers['If-None-Match'] = cached.etag;
         console.log('[Ticker] Requesting news, city="' + city + '"');
-        fetch('/api/investment-news?city=' + encodeURIComponent(city))
+        fetch('/api/investment-news?city=' + encodeURIComponent(city), { headers: headers })
             .then(function (r) {
+                if (r.status === 304 && cached) {
+                    cached.at = Date.now();
+                    writeTickerCache(city, cached);
+                    return null;
+                }
                 if (!r.ok) throw new Error('HTTP ' + r.status);
-                return r.json();
+                return r.json().then(function (data) {
+                    return { data: data, etag: r.headers.get('ETag') };
+                });
             })
-            .then(function (data) {
-                if (data && data.news) insertTicker(data.news, data.city || '');
+            .then(function (result) {
+                var data = result && result.data;
+                if (!data || !data.news) return;
+                if (!cached || cached.news !== data.news) insertTicker(data.news, data.city || '');
+                if (data.pending) { streamTicker(city); return; }
+                writeTickerCache(city, { news: data.news, city: data.city || '', etag: result.etag, at: Date.now() });
             })
             .catch(function (err) { console.error('[Ticker] Failed:', err); });
     }
 
+    function streamTicker(city) {
+        var text = '';
+        streamAIContent('news', city, {
+            token: function (fragment) {
+                text += fragment;
+                updateTicker(text, city);
+            },
+            done: function (news) {
+                if (!news) return;
+                updateTicker(news, city);
+                writeTickerCache(city, { news: news, city: city, etag: null, at: Date.now() });
+            },
+        });
+    }
+
+    // =====================================================
+    // AI CONTENT STREAMING
+    // =====================================================
+    // /api/ai-stream/<kind> relays the LLM answer as server-sent
+    // events: 'token' events carry fragments as they are generated,
+    // the final 'done' event the content stored in the cache.
+
+    function streamAIContent(kind, city, handlers) {
+        if (!window.EventSource) return;
+        var source = new EventSource('/api/ai-stream/' + kind + '?city=' + encodeURIComponent(city));
+        source.addEventListener('token', function (e) {
+            handlers.token(JSON.parse(e.data));
+        });
+        source.addEventListener('done', function (e) {
+            source.close();
+            handlers.done(JSON.parse(e.data));
+        });
+        source.onerror = function () {
+            // Do not let EventSource reconnect and start a new generation
+            source.close();
+            console.error('[Stream] ' + kind + ' stream failed');
+        };
+    }
+
+    // City investment panels: while the answer is incomplete JSON, show
+    // the bullet points received so far as plain text, then swap in the
+    // sanitized HTML sent with the 'done' event.
+    var CITY_INFO_KEYS = {
+        ai_investment_reasons: 'investment_reasons',
+        ai_growth_potential: 'growth_potential',
+        ai_infrastructure: 'infrastructure',
+        ai_market_trends: 'market_trends',
+    };
+
+    function partialJsonList(text, key) {
+        var start = text.indexOf('"' + key + '"');
+        if (start < 0) return [];
+        var rest = text.slice(start + key.length + 2);
+        var colon = rest.indexOf(':');
+        if (colon < 0) return [];
+        rest = rest.slice(colon + 1);
+        var end = rest.search(/[\]}]/);
+        if (end >= 0) rest = rest.slice(0, end);
+
+        var items = [], re = /"((?:[^"\\]|\\.)*)"?/g, m;
+        while ((m = re.exec(rest))) {
+            if (m[1]) items.push(m[1].replace(/\\(.)/g, '$1'));
+        }
+        return items;
+    }
+
+    function renderPartialList(el, items) {
+        var ul = document.createElement('ul');
+        items.forEach(function (item) {
+            var li = document.createElement('li');
+            li.textContent = item;
+            ul.appendChild(li);
+        });
+        el.innerHTML = '';
+        el.appendChild(ul);
+    }
+
+    function loadCityInsights() {
+        var section = document.querySelector('#investment-overview[data-ai-stream]');
+        if (!section) return;
+        var boxes = section.querySelectorAll('[data-ai-key]');
+        var text = '';
+        streamAIContent('investment-info', section.dataset.aiStream, {
+            token: function (fragment) {
+                text += fragment;
+                for (var i = 0; i < boxes.length; i++) {
+                    var items = partialJsonList(text, CITY_INFO_KEYS[boxes[i].dataset.aiKey]);
+                    if (items.length) renderPartialList(boxes[i], items);
+                }
+            },
+            done: function (info) {
+                if (!info) return;
+                for (var i = 0; i < boxes.length; i++) {
+                    var html = info[boxes[i].dataset.aiKey];
+                    if (html) boxes[i].innerHTML = html;
+                }
+            },
+        });
+    }
+
     // =====================================================
     // PROPERTY MAP
     // =====================================================
@@ -122,19 +264,22 @@
             mapEl.innerHTML   = '';
         }
 
-        var properties = [];
+        var endpoint = dataEl.dataset.endpoint || '/property/map/markers';
+        var city     = dataEl.dataset.city || '';
+        var category = '';
+        try { category = new URLSearchParams(window.location.search).get('category_id') || ''; }
+        catch (e) { /* ignore */ }
+
+        var initialBounds = null;
         try {
-            properties = JSON.parse(dataEl.dataset.properties || '[]');
-            if (!Array.isArray(properties)) properties = [];
-        } catch (e) { console.error('[PropertyMap] bad JSON', e); }
+            initialBounds = JSON.parse(dataEl.dataset.bounds || 'null');
+        } catch (e) { console.error('[PropertyMap] bad bounds JSON', e); }
 
         var categoryColors = {};
         try {
             categoryColors = JSON.parse(legendEl.dataset.colors || '{}');
         } catch (e) { console.error('[PropertyMap] bad colors JSON', e); }
 
-        console.log('[PropertyMap] ' + properties.length + ' properties');
-
         function waitForLeaflet(cb) {
             if (typeof L !== 'undefined') { cb(); return; }
             setTimeout(function () { waitForLeaflet(cb); }, 200);
@@ -189,18 +334,43 @@
                     '</div></div>';
             }
 
-            var markerLatLngs = [];
+            // Markers currently on the map, keyed by property id, so that
+            // overlapping viewport requests never add the same marker twice.
+            var markerLayer = L.layerGroup().addTo(map);
+            var markersById = {};
+
+            // Hover cards are fetched once per property and kept for the
+            // lifetime of the page.
+            var cardCache = {};
+
+            function loadCard(id) {
+                if (!cardCache[id]) {
+                    cardCache[id] = fetch('/property/' + id + '/card')
+                        .then(function (r) {
+                            if (!r.ok) throw new Error('HTTP ' + r.status);
+                            return r.json();
+                        })
+                        .catch(function (err) {
+                            delete cardCache[id];
+                            throw err;
+                        });
+                }
+                return cardCache[id];
+            }
 
-            properties.forEach(function (p) {
-                if (!p.latitude || !p.longitude) return;
+            function addMarker(id, lat, lng, category) {
+                if (markersById[id]) return;
 
-                var color  = categoryColors[p.property_type] || '#4f46e5';
-                var marker = L.marker([p.latitude, p.longitude], {
-                    icon: createIcon(color)
-                }).addTo(map);
-                markerLatLngs.push([p.latitude, p.longitude]);
+                var marker = L.marker([lat, lng], {
+                    icon: createIcon(category.color || '#4f46e5')
+                }).addTo(markerLayer);
+                markersById[id] = marker;
 
-                marker.bindPopup(popupHtml(p), {
+                marker.bindPopup(
+                    '<div class="property-hover-card"><div class="property-content">' +
+                        '<div class="property-category">' + (category.name || '') + '</div>' +
+                        '<div class="property-location">Loading…</div>' +
+                    '</div></div>', {
                     closeButton: false, autoClose: false, closeOnClick: false,
                     className: 'custom-popup', minWidth: 280, maxWidth: 320
                 });
@@ -209,6 +379,9 @@
                     if (openPopupMarker && openPopupMarker !== marker) openPopupMarker.closePopup();
                     marker.openPopup();
                     openPopupMarker = marker;
+                    loadCard(id)
+                        .then(function (card) { marker.setPopupContent(popupHtml(card)); })
+                        .catch(function (err) { console.error('[PropertyMap] Card fetch failed:', err); });
                 });
 
                 marker.on('mouseout', function () {
@@ -234,7 +407,117 @@
                         }, 100);
                     });
                 });
-            });
+            }
+
+            // Server-side clusters shown below the cluster zoom level.
+            // They are replaced wholesale on every viewport response.
+            var clusterLayer = L.layerGroup().addTo(map);
+
+            function formatPrice(value) {
+                return '₹' + Math.round(value).toLocaleString('en-IN');
+            }
+
+            function addCluster(c) {
+                var size   = Math.min(64, 30 + Math.round(Math.log(c.count) * 6));
+                var latlng = [c.lat, c.lng];
+                var marker = L.marker(latlng, {
+                    icon: L.divIcon({
+                        className: 'custom-cluster',
+                        html: '<div style="width:' + size + 'px;height:' + size + 'px;border-radius:50%;' +
+                              'background:rgba(37,99,235,0.85);border:3px solid white;' +
+                              'box-shadow:0 3px 12px rgba(0,0,0,0.3);' +
+                              'display:flex;align-items:center;justify-content:center;' +
+                              'font-size:13px;font-weight:700;color:white;cursor:pointer;">' + c.count + '</div>',
+                        iconSize: [size, size], iconAnchor: [size / 2, size / 2]
+                    })
+                }).addTo(clusterLayer);
+
+                marker.bindTooltip(
+                    c.count + (c.count === 1 ? ' property' : ' properties') + '<br/>' +
+                    (c.price_max > 0
+                        ? formatPrice(c.price_min) + ' – ' + formatPrice(c.price_max) +
+                          ' (avg ' + formatPrice(c.price_avg) + ')'
+                        : 'Price on Request'),
+                    { direction: 'top' }
+                );
+                marker.on('click', function () {
+                    map.setView(latlng, Math.min(map.getZoom() + 2, map.getMaxZoom()));
+                });
+            }
+
+            function clearMarkers() {
+                markerLayer.clearLayers();
+                markersById = {};
+                openPopupMarker = null;
+            }
+
+            // Drop markers far outside the viewport so long browsing
+            // sessions don't accumulate the whole catalogue in the DOM.
+            function pruneMarkers(bounds) {
+                var keep = bounds.pad(0.5);
+                Object.keys(markersById).forEach(function (id) {
+                    var marker = markersById[id];
+                    if (marker === openPopupMarker || keep.contains(marker.getLatLng())) return;
+                    markerLayer.removeLayer(marker);
+                    delete markersById[id];
+                });
+            }
+
+            // Decode the columnar payload: parallel arrays indexed by
+            // marker (or cluster), categories shared through `cat`.
+            function renderClusters(data) {
+                for (var i = 0; i < data.lat.length; i++) {
+                    addCluster({
+                        lat: data.lat[i], lng: data.lng[i], count: data.count[i],
+                        price_min: data.price_min[i], price_max: data.price_max[i],
+                        price_avg: data.price_avg[i]
+                    });
+                }
+            }
+
+            function renderMarkers(data) {
+                for (var i = 0; i < data.ids.length; i++) {
+                    addMarker(data.ids[i], data.lat[i], data.lng[i], data.categories[data.cat[i]] || {});
+                }
+            }
+
+            // Every moveend bumps the generation; pages still in flight
+            // for an older viewport are discarded when they arrive.
+            var generation = 0;
+
+            function fetchMarkers(gen, bbox, zoom, offset) {
+                var params = new URLSearchParams({ bbox: bbox, zoom: zoom, offset: offset });
+                if (city) params.set('city', city);
+                if (category) params.set('category_id', category);
+
+                fetch(endpoint + '?' + params.toString())
+                    .then(function (r) {
+                        if (!r.ok) throw new Error('HTTP ' + r.status);
+                        return r.json();
+                    })
+                    .then(function (data) {
+                        if (gen !== generation) return;
+                        if (data.clustered) {
+                            clearMarkers();
+                            clusterLayer.clearLayers();
+                            renderClusters(data);
+                            return;
+                        }
+                        if (!offset) clusterLayer.clearLayers();
+                        renderMarkers(data);
+                        if (data.next_offset) fetchMarkers(gen, bbox, zoom, data.next_offset);
+                    })
+                    .catch(function (err) { console.error('[PropertyMap] Marker fetch failed:', err); });
+            }
+
+            function loadViewport() {
+                generation += 1;
+                var bounds = map.getBounds();
+                pruneMarkers(bounds);
+                fetchMarkers(generation, bounds.toBBoxString(), map.getZoom(), 0);
+            }
+
+            map.on('moveend', loadViewport);
 
             map.on('click', function () {
                 if (openPopupMarker) { openPopupMarker.closePopup(); openPopupMarker = null; }
@@ -246,16 +529,15 @@
                        '<span>' + e[0] + '</span></div>';
             }).join('');
 
-            if (markerLatLngs.length === 1) {
-                map.setView(markerLatLngs[0], 15);
-            } else if (markerLatLngs.length > 1) {
-                var grp    = L.featureGroup(markerLatLngs.map(function (ll) { return L.marker(ll); }));
-                var bounds = grp.getBounds();
-                if (bounds.isValid()) {
+            // Setting the initial view fires the first moveend, which loads
+            // the markers of that viewport.
+            var bounds = initialBounds ? L.latLngBounds(initialBounds) : null;
+            if (bounds && bounds.isValid()) {
+                if (bounds.getNorthEast().equals(bounds.getSouthWest())) {
+                    map.setView(bounds.getCenter(), 15);
+                } else {
                     map.fitBounds(bounds.pad(0.1));
                     if (map.getZoom() < 8) map.setView(bounds.getCenter(), 10);
-                } else {
-                    map.setView([20.5937, 78.9629], 5);
                 }
             } else {
                 map.setView([20.5937, 78.9629], 5);
@@ -270,6 +552,7 @@
     // =====================================================
     function boot() {
         loadTicker();
+        loadCityInsights();
         initPropertyMap();
     }
 
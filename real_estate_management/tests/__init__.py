@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+from . import test_llm_cache
+from . import test_geocoder
+from . import test_geocoding
+from . import test_property_view_hit
+from . import test_map_markers
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import base64
+
+from odoo.tests import TransactionCase
+
+
+class RealEstateCase(TransactionCase):
+    """Shared records and a property factory filling the required fields"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.country = cls.env.ref('base.in')
+        cls.state = cls.env['res.country.state'].search([('country_id', '=', cls.country.id)], limit=1)
+        cls.category = cls.env['property.category'].create({'name': 'Test Plots', 'seo_title': 'Test Plots'})
+        cls.document = base64.b64encode(b'%PDF-1.4 test document')
+        # No throttling between the geocoder calls of the tests
+        cls.env['ir.config_parameter'].sudo().set_param('real_estate.geocode_rate_limit', 0)
+
+    @classmethod
+    def _create_property(cls, **vals):
+        return cls.env['property.property'].create(dict({
+            'name': 'Test Plot',
+            'price': 1000000,
+            'plot_area': 1200,
+            'facing_direction': 'east',
+            'road_width': 30,
+            'title_status': 'clear',
+            'adhar_image': cls.document,
+            'agreement_document': cls.document,
+            'street': '12 MG Road',
+            'city': 'Testpur',
+            'zip_code': '560001',
+            'state_id': cls.state.id,
+            'country_id': cls.country.id,
+            'category_id': cls.category.id,
+            'contact_name': 'Test Contact',
+            'contact_phone': '+91 90000 00000',
+            'contact_email': 'contact@example.com',
+            'seo_title': 'Test Plot',
+            'nearby_landmarks': 'Metro station',
+        }, **vals))
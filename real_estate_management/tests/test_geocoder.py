@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from .common import RealEstateCase
+
+
+class StandInGeocoderHandler(BaseHTTPRequestHandler):
+    """Answers every query with the (status, JSON body) set on the server"""
+
+    def do_GET(self):
+        status, body = self.server.answer
+        self.server.query_count += 1
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@tagged('post_install', '-at_install')
+class TestStandInGeocoder(RealEstateCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInGeocoderHandler)
+        cls.server.answer = (200, [])
+        cls.server.query_count = 0
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+
+        ICP = cls.env['ir.config_parameter'].sudo()
+        ICP.set_param('real_estate.geocoder_url', f'http://127.0.0.1:{cls.server.server_port}/search')
+        provider = cls.env['base.geo_provider'].search([('tech_name', '=', 'openstreetmap')], limit=1)
+        ICP.set_param('base_geolocalize.geo_provider', provider.id)
+        cls.Geocoder = cls.env['base.geocoder']
+
+    def test_found(self):
+        self.server.answer = (200, [{'lat': '12.5', 'lon': '77.25', 'display_name': 'Testpur'}])
+        self.assertEqual(self.Geocoder.geo_find('12 MG Road, Testpur'), (12.5, 77.25))
+
+    def test_not_found(self):
+        self.server.answer = (200, [])
+        self.assertIsNone(self.Geocoder.geo_find('Nowhere'))
+
+    def test_error_status_raises(self):
+        for status in (429, 503):
+            self.server.answer = (status, {'error': {'message': f'Mock error {status}'}})
+            with self.assertRaises(UserError):
+                self.Geocoder.geo_find('12 MG Road, Testpur')
+
+    def test_outage_is_retried_not_cached(self):
+        prop = self._create_property()
+        self.assertEqual(prop.geocode_state, 'pending')
+        GeocodeCache = self.env['property.geocode.cache']
+
+        self.server.answer = (503, {'error': {'message': 'Mock error 503'}})
+        self.assertFalse(prop._geocode_now())
+        self.assertEqual(prop.geocode_state, 'pending', "An outage must not fail the address")
+        self.assertEqual(prop.geocode_attempts, 1)
+        self.assertTrue(prop.geocode_next_try)
+        self.assertFalse(GeocodeCache._lookup(prop._get_geocode_address()), "An outage must not be cached")
+
+        self.server.answer = (200, [{'lat': '12.5', 'lon': '77.25', 'display_name': 'Testpur'}])
+        self.assertTrue(prop._geocode_now())
+        self.assertEqual(prop.geocode_state, 'done')
+        self.assertAlmostEqual(prop.latitude, 12.5)
+        self.assertTrue(GeocodeCache._lookup(prop._get_geocode_address()).found)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from ..models.property import GEOCODE_MAX_ATTEMPTS, GEOCODE_RETRY_DELAY, RateLimiter
+from .common import RealEstateCase
+
+
+@tagged('post_install', '-at_install')
+class TestGeocodingQueue(RealEstateCase):
+
+    def setUp(self):
+        super().setUp()
+        # Commits of the crons would end the test transaction
+        self.patch(self.env.cr, 'commit', lambda: None)
+        self.GeocodeCache = self.env['property.geocode.cache']
+
+    def _patch_geo_find(self, **kwargs):
+        return patch.object(type(self.env['base.geocoder']), 'geo_find', autospec=True, **kwargs)
+
+    def test_retry_backoff_then_failed(self):
+        prop = self._create_property(street='1 Retry Lane')
+        self.assertEqual(prop.geocode_state, 'pending')
+        with self._patch_geo_find(side_effect=UserError("Geocoder unavailable")):
+            for attempt in range(1, GEOCODE_MAX_ATTEMPTS):
+                before = fields.Datetime.now()
+                self.assertFalse(prop._geocode_now())
+                delay = GEOCODE_RETRY_DELAY * 2 ** (attempt - 1)
+                self.assertEqual(prop.geocode_state, 'pending')
+                self.assertEqual(prop.geocode_attempts, attempt)
+                self.assertGreaterEqual(prop.geocode_next_try, before + delay)
+                self.assertLessEqual(prop.geocode_next_try, fields.Datetime.now() + delay)
+            self.assertFalse(prop._geocode_now())
+        self.assertEqual(prop.geocode_state, 'failed')
+        self.assertEqual(prop.geocode_attempts, GEOCODE_MAX_ATTEMPTS)
+        self.assertFalse(prop.geocode_next_try)
+
+    def test_transient_error_not_cached(self):
+        prop = self._create_property(street='2 Outage Street')
+        with self._patch_geo_find(side_effect=UserError("Geocoder unavailable")):
+            prop._geocode_now()
+        self.assertFalse(self.GeocodeCache.search([
+            ('fingerprint', '=', self.GeocodeCache._get_fingerprint(prop._get_geocode_address()))]))
+
+    def test_cron_geocodes_due_properties(self):
+        due = self._create_property(street='3 Due Road')
+        later = self._create_property(street='4 Later Road')
+        later.write({'geocode_next_try': fields.Datetime.now() + GEOCODE_RETRY_DELAY})
+        with self._patch_geo_find(return_value=(12.5, 77.25)):
+            self.env['property.property']._cron_geocode_pending()
+        self.assertEqual(due.geocode_state, 'done')
+        self.assertAlmostEqual(due.latitude, 12.5)
+        self.assertAlmostEqual(due.longitude, 77.25)
+        self.assertEqual(due.geocode_attempts, 0)
+        self.assertEqual(later.geocode_state, 'pending', "Not due before its next try")
+
+
+@tagged('post_install', '-at_install')
+class TestGeocodeCache(RealEstateCase):
+
+    def setUp(self):
+        super().setUp()
+        self.GeocodeCache = self.env['property.geocode.cache']
+
+    def _patch_geo_find(self, **kwargs):
+        return patch.object(type(self.env['base.geocoder']), 'geo_find', autospec=True, **kwargs)
+
+    def test_cached_positive_result(self):
+        first = self._create_property(street='5 Cached Avenue')
+        with self._patch_geo_find(return_value=(12.5, 77.25)):
+            self.assertTrue(first._geocode_now())
+        # Same address, spelled differently
+        second = self._create_property(street='5, CACHED   avenue')
+        with self._patch_geo_find() as geo_find:
+            self.assertTrue(second._geocode_now())
+        geo_find.assert_not_called()
+        self.assertEqual(second.geocode_state, 'done')
+        self.assertAlmostEqual(second.latitude, 12.5)
+
+    def test_cached_negative_result(self):
+        first = self._create_property(street='6 Unknown Alley')
+        with self._patch_geo_find(return_value=None):
+            self.assertFalse(first._geocode_now())
+        self.assertEqual(first.geocode_state, 'pending', "A provider miss is retried once")
+        entry = self.GeocodeCache._lookup(first._get_geocode_address())
+        self.assertTrue(entry)
+        self.assertFalse(entry.found)
+
+        second = self._create_property(street='6 Unknown Alley')
+        with self._patch_geo_find() as geo_find:
+            self.assertFalse(second._geocode_now())
+        geo_find.assert_not_called()
+        self.assertEqual(second.geocode_state, 'failed', "A cached miss will not change before it expires")
+
+    def test_force_bypasses_cache(self):
+        prop = self._create_property(street='7 Forced Street')
+        self.GeocodeCache._store(prop._get_geocode_address(), None)
+        with self._patch_geo_find(return_value=(13.0, 77.5)) as geo_find:
+            self.assertTrue(prop._geocode_now(force=True))
+        geo_find.assert_called()
+        self.assertTrue(self.GeocodeCache._lookup(prop._get_geocode_address()).found)
+
+
+@tagged('post_install', '-at_install')
+class TestGeocodeAddressHash(RealEstateCase):
+
+    def setUp(self):
+        super().setUp()
+        self.prop = self._create_property(street='8 Stable Road')
+        with patch.object(type(self.env['base.geocoder']), 'geo_find', autospec=True, return_value=(12.5, 77.25)):
+            self.prop._geocode_now()
+        self.assertEqual(self.prop.geocode_state, 'done')
+
+    def test_unrelated_write_keeps_result(self):
+        self.prop.write({'name': 'Renamed Plot', 'price': 2000000})
+        self.assertEqual(self.prop.geocode_state, 'done')
+        self.assertAlmostEqual(self.prop.latitude, 12.5)
+
+    def test_equivalent_address_keeps_result(self):
+        address_hash = self.prop.address_hash
+        self.prop.write({'street': '8, STABLE  road', 'city': self.prop.city})
+        self.assertEqual(self.prop.geocode_state, 'done')
+        self.assertEqual(self.prop.address_hash, address_hash)
+        self.assertAlmostEqual(self.prop.latitude, 12.5)
+
+    def test_changed_address_is_queued(self):
+        address_hash = self.prop.address_hash
+        self.prop.write({'street': '9 Moved Road'})
+        self.assertEqual(self.prop.geocode_state, 'pending')
+        self.assertEqual(self.prop.geocode_attempts, 0)
+        self.assertNotEqual(self.prop.address_hash, address_hash)
+
+
+@tagged('post_install', '-at_install')
+class TestGeocodeBackfill(RealEstateCase):
+
+    def setUp(self):
+        super().setUp()
+        self.patch(self.env.cr, 'commit', lambda: None)
+        self.properties = self.env['property.property']
+        for i in range(5):
+            self.properties |= self._create_property(street=f'{10 + i} Backfill Street')
+        # Keep the run to the properties of the test
+        properties = self.properties
+        self.patch(type(self.env['property.geocode.backfill']), '_get_property_domain',
+                   lambda backfill: [('id', 'in', properties.ids)])
+        self.backfill = self.env['property.geocode.backfill'].create({
+            'name': 'Test Backfill',
+            'scope': 'all',
+            'chunk_size': 2,
+            'requests_per_second': 0,
+        })
+        self.startPatcher(patch.object(type(self.env['base.geocoder']), 'geo_find', autospec=True,
+                                       return_value=(12.5, 77.25)))
+
+    def test_chunks_and_resume(self):
+        self.backfill.action_start()
+        self.assertEqual(self.backfill.total_count, 5)
+
+        self.assertTrue(self.backfill._run_chunk(RateLimiter(0)))
+        self.assertEqual(self.backfill.last_id, self.properties[1].id)
+        self.assertEqual(self.backfill.processed_count, 2)
+        self.assertEqual(self.backfill.chunk_count, 1)
+
+        # Pausing and starting again resumes after the cursor
+        self.backfill.action_pause()
+        self.assertEqual(self.backfill.state, 'paused')
+        self.backfill.action_start()
+        self.assertEqual(self.backfill.total_count, 5)
+        self.assertTrue(self.backfill._run_chunk(RateLimiter(0)))
+        self.assertEqual(self.backfill.last_id, self.properties[3].id)
+        self.assertEqual(self.backfill.processed_count, 4)
+
+        self.env['property.geocode.backfill']._cron_process()
+        self.assertEqual(self.backfill.state, 'done')
+        self.assertEqual(self.backfill.processed_count, 5)
+        self.assertEqual(self.backfill.located_count, 5)
+        self.assertEqual(self.backfill.failed_count, 0)
+        self.assertEqual(set(self.properties.mapped('geocode_state')), {'done'})
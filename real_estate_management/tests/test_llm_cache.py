@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import threading
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+from ..models.llm_client import (
+    AdaptiveConcurrencyLimiter, CircuitBreaker, LLMError, LLMUnavailable, chat_completion, parse_json_answer,
+)
+from ..models.property_ai_cache import SingleFlight
+
+MESSAGES = [
+    {'role': 'system', 'content': 'You are a real estate analyst. Return only JSON.'},
+    {'role': 'user', 'content': 'Describe plot 42'},
+]
+
+
+@tagged('post_install', '-at_install')
+class TestLLMResponseCache(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Cache = cls.env['property.llm.response.cache'].sudo()
+        cls.ICP = cls.env['ir.config_parameter'].sudo()
+
+    def _store(self, fingerprint, response='{}'):
+        self.Cache._store(fingerprint, 'test-model', MESSAGES, response)
+
+    def test_fingerprint(self):
+        params = {'max_tokens': 800, 'temperature': 0.3}
+        fingerprint = self.Cache._get_fingerprint('test-model', MESSAGES, params)
+        self.assertEqual(fingerprint, self.Cache._get_fingerprint(
+            'test-model', MESSAGES, {'temperature': 0.3, 'max_tokens': 800}), "Key order must not matter")
+        self.assertNotEqual(fingerprint, self.Cache._get_fingerprint(
+            'test-model', MESSAGES, dict(params, temperature=0.7)))
+        self.assertNotEqual(fingerprint, self.Cache._get_fingerprint('other-model', MESSAGES, params))
+        self.assertNotEqual(fingerprint, self.Cache._get_fingerprint('test-model', MESSAGES[1:], params))
+
+    def test_lookup_store(self):
+        self.assertIsNone(self.Cache._lookup('fp-roundtrip'))
+        self._store('fp-roundtrip', '{"a": 1}')
+        self.assertEqual(self.Cache._lookup('fp-roundtrip'), '{"a": 1}')
+        self._store('fp-roundtrip', '{"a": 2}')
+        self.assertEqual(self.Cache._lookup('fp-roundtrip'), '{"a": 2}', "Storing again replaces the response")
+
+    def test_ttl(self):
+        self.ICP.set_param('real_estate.llm_cache_ttl_days', 30)
+        self._store('fp-expired')
+        self.env.cr.execute("UPDATE property_llm_response_cache SET create_date = %s WHERE fingerprint = %s",
+                            [fields.Datetime.now() - timedelta(days=31), 'fp-expired'])
+        self.assertIsNone(self.Cache._lookup('fp-expired'))
+        self.Cache._cron_evict()
+        self.assertFalse(self.Cache.search([('fingerprint', '=', 'fp-expired')]))
+
+    def test_evict_least_recently_used(self):
+        self.Cache.search([]).unlink()
+        self.ICP.set_param('real_estate.llm_cache_max_entries', 2)
+        now = fields.Datetime.now()
+        for age, fingerprint in enumerate(['fp-new', 'fp-mid', 'fp-old']):
+            self._store(fingerprint)
+            self.env.cr.execute("UPDATE property_llm_response_cache SET last_used = %s WHERE fingerprint = %s",
+                                [now - timedelta(hours=age), fingerprint])
+        self.Cache._cron_evict()
+        self.assertEqual(sorted(self.Cache.search([]).mapped('fingerprint')), ['fp-mid', 'fp-new'])
+
+    def test_chat_caches_parsed_answers_only(self):
+        LLM = self.env['property.llm.client']
+        self.ICP.set_param('groq.api_key', 'test')
+        # Metrics are written from their own cursor, keep them out of the test
+        with patch('odoo.addons.real_estate_management.models.llm_metric.record_llm_call'), \
+                patch('odoo.addons.real_estate_management.models.llm_client.chat_completion',
+                      return_value='not json') as chat_completion:
+            with self.assertRaises(LLMError):
+                LLM._chat_json(MESSAGES, use_cache=True, caller='other')
+            with self.assertRaises(LLMError):
+                LLM._chat_json(MESSAGES, use_cache=True, caller='other')
+            self.assertEqual(chat_completion.call_count, 2, "A malformed answer must not be cached")
+
+            chat_completion.return_value = '{"ok": true}'
+            self.assertEqual(LLM._chat_json(MESSAGES, use_cache=True, caller='other'), {'ok': True})
+            self.assertEqual(LLM._chat_json(MESSAGES, use_cache=True, caller='other'), {'ok': True})
+            self.assertEqual(chat_completion.call_count, 3)
+
+
+@tagged('post_install', '-at_install')
+class TestLLMHelpers(TransactionCase):
+
+    def test_parse_json_answer(self):
+        self.assertEqual(parse_json_answer('{"a": [1, 2]}'), {'a': [1, 2]})
+        self.assertEqual(parse_json_answer('```json\n{"a": 1}\n```'), {'a': 1})
+        with self.assertRaises(LLMError):
+            parse_json_answer('Sure! Here is the JSON you asked for.')
+
+    def test_single_flight(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'result'
+
+        waiting = threading.Event()
+
+        class ObservedEvent(threading.Event):
+            def wait(self, timeout=None):
+                waiting.set()
+                return super().wait(timeout)
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+        leader.start()
+        started.wait(5)
+        # Let the leader finish only once the follower waits on it
+        flight.calls['key']['event'] = ObservedEvent()
+        follower = threading.Thread(target=lambda: results.append(flight.do('key', slow, timeout=5)))
+        follower.start()
+        waiting.wait(5)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [('result', False), ('result', True)])
+        self.assertEqual(flight.do('key', lambda: 'again'), ('again', True), "Finished calls are forgotten")
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker()
+        breaker.record_failure(threshold=2)
+        self.assertTrue(breaker.allow(cooldown=60))
+        breaker.record_failure(threshold=2)
+        self.assertFalse(breaker.allow(cooldown=60), "Open after the threshold")
+        # Half-open once the cooldown is over: a single trial call
+        self.assertTrue(breaker.allow(cooldown=0))
+        self.assertFalse(breaker.allow(cooldown=0))
+        breaker.record_success()
+        self.assertTrue(breaker.allow(cooldown=60))
+        self.assertTrue(breaker.allow(cooldown=60))
+
+    def test_breaker_ignores_request_errors(self):
+        settings = {
+            'dbname': None, 'base_url': 'http://127.0.0.1:1/v1', 'model': 'test-model', 'timeout': 1,
+            'max_retries': 0, 'breaker_threshold': 2, 'breaker_cooldown': 60,
+        }
+        llm_client = 'odoo.addons.real_estate_management.models.llm_client'
+        with patch(f'{llm_client}._breaker', CircuitBreaker()), \
+                patch(f'{llm_client}._session') as session:
+            session.post.return_value = Mock(status_code=401, text='Invalid API key')
+            for _i in range(3):
+                with self.assertRaisesRegex(LLMError, '401'):
+                    chat_completion(settings, 'bad-key', MESSAGES)
+            # Overload does open it
+            session.post.return_value = Mock(status_code=503, text='Unavailable', headers={})
+            for _i in range(2):
+                with self.assertRaisesRegex(LLMError, '503'):
+                    chat_completion(settings, 'key', MESSAGES)
+            with self.assertRaises(LLMUnavailable):
+                chat_completion(settings, 'key', MESSAGES)
+
+    def test_adaptive_concurrency_limiter(self):
+        limiter = AdaptiveConcurrencyLimiter(8)
+        limiter.back_off()
+        limiter.back_off()
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.rate_limited, 2)
+        for _i in range(2):
+            with limiter:
+                pass
+        self.assertEqual(limiter.limit, 3, "Grows back by one after a streak of successes")
+        for _i in range(20):
+            limiter.back_off()
+        self.assertEqual(limiter.limit, 1)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import math
+
+from odoo.tests import HttpCase, tagged
+
+from ..models.property import MAP_CLUSTER_MAX_ZOOM, _public_data_cache
+from .common import RealEstateCase
+
+# Far from any real listing, so demo data stays out of the viewports
+ORIGIN_LATITUDE, ORIGIN_LONGITUDE = -45.0, -140.0
+
+
+@tagged('post_install', '-at_install')
+class TestMapClusters(RealEstateCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Property = self.env['property.property']
+
+    def test_cluster_straddling_viewport_edge(self):
+        zoom = 6
+        cell = self.Property._get_map_cluster_cell_size(zoom)
+        south = math.floor(ORIGIN_LATITUDE / cell) * cell
+        west = math.floor(ORIGIN_LONGITUDE / cell) * cell
+        # Both properties, and so the centroid, in the top right of the cell
+        for offset in (0.8, 0.9):
+            self._create_property(street=f'{offset} Edge Road', is_published=True,
+                                  latitude=south + offset * cell, longitude=west + offset * cell)
+        _public_data_cache.clear()
+
+        # The viewport only covers the bottom left corner of the cell
+        clusters = self.Property._get_map_clusters(
+            zoom, west + 0.1 * cell, south + 0.1 * cell, west + 0.3 * cell, south + 0.3 * cell)
+        self.assertEqual([cluster['count'] for cluster in clusters], [2])
+
+        # A viewport next to the cell does not show it
+        clusters = self.Property._get_map_clusters(
+            zoom, west + 1.1 * cell, south + 0.1 * cell, west + 1.3 * cell, south + 0.3 * cell)
+        self.assertFalse(clusters)
+
+
+@tagged('post_install', '-at_install')
+class TestMapMarkers(RealEstateCase, HttpCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.inside = cls.env['property.property']
+        for i in range(3):
+            cls.inside |= cls._create_property(
+                street=f'{i} Marker Road', is_published=True, price=1000000 * (i + 1),
+                latitude=ORIGIN_LATITUDE + 0.01 * i, longitude=ORIGIN_LONGITUDE + 0.01 * i)
+        cls.outside = cls._create_property(street='9 Far Road', is_published=True,
+                                           latitude=ORIGIN_LATITUDE + 1, longitude=ORIGIN_LONGITUDE + 1)
+        cls.bbox = f'{ORIGIN_LONGITUDE - 0.1},{ORIGIN_LATITUDE - 0.1},{ORIGIN_LONGITUDE + 0.1},{ORIGIN_LATITUDE + 0.1}'
+
+    def setUp(self):
+        super().setUp()
+        # Aggregates cached under the current version may predate the test records
+        _public_data_cache.clear()
+
+    def _get_markers(self, **params):
+        params = dict({'bbox': self.bbox}, **params)
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.url_open(f'/property/map/markers?{query}')
+
+    def test_markers_in_bbox(self):
+        response = self._get_markers(zoom=MAP_CLUSTER_MAX_ZOOM)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertFalse(data['clustered'])
+        self.assertEqual(data['ids'], self.inside.ids)
+        self.assertIsNone(data['next_offset'])
+
+    def test_columnar_payload(self):
+        data = self._get_markers(zoom=MAP_CLUSTER_MAX_ZOOM).json()
+        for column in ('lat', 'lng', 'price', 'cat'):
+            self.assertEqual(len(data[column]), len(data['ids']), column)
+        self.assertEqual(data['categories'], [{
+            'name': self.category.name,
+            'color': self.env['property.property']._get_map_marker_color(self.category),
+        }])
+        self.assertEqual(data['cat'], [0, 0, 0])
+        self.assertEqual(data['price'], [1000000, 2000000, 3000000])
+        self.assertEqual(data['lat'][0], round(ORIGIN_LATITUDE, 5))
+
+    def test_paging(self):
+        first = self._get_markers(zoom=MAP_CLUSTER_MAX_ZOOM, limit=2).json()
+        self.assertEqual(first['ids'], self.inside[:2].ids)
+        self.assertEqual(first['next_offset'], 2)
+        second = self._get_markers(zoom=MAP_CLUSTER_MAX_ZOOM, limit=2, offset=first['next_offset']).json()
+        self.assertEqual(second['ids'], self.inside[2:].ids)
+        self.assertIsNone(second['next_offset'])
+
+    def test_clusters_below_max_zoom(self):
+        data = self._get_markers(zoom=MAP_CLUSTER_MAX_ZOOM - 1).json()
+        self.assertTrue(data['clustered'])
+        self.assertEqual(sum(data['count']), 3)
+        for column in ('lat', 'lng', 'price_min', 'price_max', 'price_avg'):
+            self.assertEqual(len(data[column]), len(data['count']), column)
+        self.assertEqual(min(data['price_min']), 1000000)
+        self.assertEqual(max(data['price_max']), 3000000)
+
+    def test_filters(self):
+        data = self._get_markers(zoom=MAP_CLUSTER_MAX_ZOOM, city='Testpur', category_id=self.category.id).json()
+        self.assertEqual(data['ids'], self.inside.ids)
+
+    def test_invalid_parameters(self):
+        for params in [
+            {'bbox': 'not,a,bbox'},
+            {'zoom': -1},
+            {'zoom': 'x'},
+            {'city': 'Atlantis'},
+            {'category_id': self.category.id + 1000000},
+        ]:
+            response = self._get_markers(**params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertEqual(response.json(), {'error': 'Invalid map parameters'})
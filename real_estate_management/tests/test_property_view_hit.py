@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+from odoo.tests import tagged
+
+from .common import RealEstateCase
+
+
+@tagged('post_install', '-at_install')
+class TestPropertyViewHit(RealEstateCase):
+
+    def setUp(self):
+        super().setUp()
+        self.patch(self.env.cr, 'commit', lambda: None)
+        self.ViewHit = self.env['property.view.hit']
+
+    def test_cron_flush(self):
+        first = self._create_property(street='20 Viewed Road')
+        second = self._create_property(street='21 Viewed Road')
+        untouched = self._create_property(street='22 Viewed Road')
+        first.write({'views': 10, 'last_viewed': datetime(2020, 1, 1)})
+        self.ViewHit.search([]).unlink()
+
+        for property_id in [first.id] * 3 + [second.id] * 2:
+            self.ViewHit._log_hit(property_id)
+        self.env.cr.execute("UPDATE property_view_hit SET viewed_at = %s WHERE property_id = %s",
+                            [datetime(2024, 5, 1, 12, 0), second.id])
+
+        self.ViewHit._cron_flush(batch_size=2)
+
+        self.assertEqual(first.views, 13)
+        self.assertGreater(first.last_viewed, datetime(2020, 1, 1))
+        self.assertEqual(second.views, 2)
+        self.assertEqual(second.last_viewed, datetime(2024, 5, 1, 12, 0))
+        self.assertEqual(untouched.views, 0)
+        self.assertFalse(untouched.last_viewed)
+        self.assertFalse(self.ViewHit.search_count([]), "Flushed hits are removed from the log")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Measure p50/p95 latency of the public AI-backed pages under concurrent load.
+
+Runs a mixed, shuffled load of anonymous requests against ``/``,
+``/?city=<city>``, ``/property/<id>`` and ``/api/investment-news`` twice:
+with the module caches on, then with ``real_estate.disable_caches`` set
+(AI content generated during the request, page, news and LLM response
+caches bypassed). Only the standard library is needed.
+
+Property AI content is data, not cache: once generated it stays on the
+property, so with caching off ``/property/<id>`` only pays for the LLM
+call on properties that have none yet. Clear ai_content_generated on the
+benchmarked properties first to measure inline generation.
+
+Start the stand-in providers first, so that no request reaches Groq or
+Nominatim:
+
+    python3 mock_ai_server.py --latency-ms 800 --jitter-ms 400
+    python3 benchmark_public_pages.py --url http://localhost:8069 --db realestate \\
+        --login admin --password admin --concurrency 10 --requests 100
+
+The Odoo server must serve only ``--db`` to anonymous visitors (single
+database or --db-filter) and run several workers, or threads. The system
+parameters the benchmark changes are put back when it ends.
+"""
+import argparse
+import json
+import math
+import random
+import statistics
+import time
+import urllib.error
+import urllib.request
+import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+# System parameters set for the run, restored afterwards
+BENCHMARK_PARAMS = [
+    'real_estate.llm_base_url',
+    'real_estate.geocoder_url',
+    'real_estate.disable_caches',
+    'groq.api_key',
+    'groq_api_key2',
+]
+
+
+class Odoo:
+    """Minimal XML-RPC client for the setup of the benchmark"""
+
+    def __init__(self, url, db, login, password):
+        self.db, self.password = db, password
+        self.uid = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/common').authenticate(db, login, password, {})
+        if not self.uid:
+            raise SystemExit(f"Cannot log in to {db} as {login}")
+        self.models = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/object', allow_none=True)
+
+    def call(self, model, method, *args, **kwargs):
+        return self.models.execute_kw(self.db, self.uid, self.password, model, method, list(args), kwargs)
+
+    def get_param(self, key):
+        return self.call('ir.config_parameter', 'get_param', key)
+
+    def set_param(self, key, value):
+        self.call('ir.config_parameter', 'set_param', key, value)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)]
+
+
+def fetch(url):
+    """GET ``url`` as an anonymous visitor; return (seconds, ok)"""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=120) as response:
+            response.read()
+            ok = response.status < 400
+    except urllib.error.HTTPError as e:
+        ok = e.code == 304
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def mock_stats(mock_url, reset=False):
+    if not mock_url:
+        return {}
+    try:
+        with urllib.request.urlopen(f"{mock_url}/stats{'/reset' if reset else ''}", timeout=5) as response:
+            return json.load(response)
+    except (urllib.error.URLError, OSError):
+        return {}
+
+
+def get_targets(odoo, base_url, max_properties):
+    """(route label, url) pairs covering published properties and their cities"""
+    properties = odoo.call('property.property', 'search_read', [('is_published', '=', True)],
+                           fields=['city'], limit=max_properties, order='id')
+    if not properties:
+        raise SystemExit("No published property to benchmark")
+    cities = sorted({p['city'] for p in properties if p['city']}) or ['']
+    targets = [('/', f'{base_url}/')]
+    targets += [('/?city=', f'{base_url}/?city={quote(city)}') for city in cities]
+    targets += [('/property/<id>', f"{base_url}/property/{p['id']}") for p in properties]
+    targets += [('/api/investment-news', f'{base_url}/api/investment-news')]
+    targets += [('/api/investment-news', f'{base_url}/api/investment-news?city={quote(city)}')
+                for city in cities]
+    return targets
+
+
+def run_mode(targets, options):
+    """Warm every URL once, then replay the shuffled mix; return the latencies per route"""
+    for _label, url in targets:
+        fetch(url)
+    mock_stats(options.mock_url, reset=True)
+
+    routes = sorted({label for label, _url in targets})
+    load = []
+    for route in routes:
+        urls = [url for label, url in targets if label == route]
+        load += [(route, urls[i % len(urls)]) for i in range(options.requests)]
+    random.shuffle(load)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options.concurrency) as executor:
+        results = list(executor.map(lambda item: (item[0],) + fetch(item[1]), load))
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    for route in routes:
+        timings = [seconds for label, seconds, ok in results if label == route and ok]
+        errors = sum(1 for label, _seconds, ok in results if label == route and not ok)
+        report[route] = {
+            'requests': len(timings) + errors,
+            'errors': errors,
+            'p50_ms': round(percentile(timings, 50) * 1000, 1) if timings else None,
+            'p95_ms': round(percentile(timings, 95) * 1000, 1) if timings else None,
+            'mean_ms': round(statistics.mean(timings) * 1000, 1) if timings else None,
+        }
+    return {
+        'routes': report,
+        'throughput_rps': round(len(results) / elapsed, 1),
+        'provider_calls': mock_stats(options.mock_url),
+    }
+
+
+def print_report(results):
+    print("\nNote: /property/<id> generates AI content inline only for properties that have none yet.")
+    print(f"{'caching':<8} {'route':<22} {'n':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for mode, result in results.items():
+        for route, row in result['routes'].items():
+            print(f"{mode:<8} {route:<22} {row['requests']:>6} {row['errors']:>5} "
+                  f"{row['p50_ms'] or '-':>9} {row['p95_ms'] or '-':>9} {row['mean_ms'] or '-':>9}")
+        print(f"{mode:<8} {'(all)':<22} {result['throughput_rps']:>6} req/s, "
+              f"provider calls {result['provider_calls'] or 'n/a'}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='http://localhost:8069', help="Odoo base URL")
+    parser.add_argument('--db', required=True)
+    parser.add_argument('--login', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--mock-url', default='http://127.0.0.1:8099',
+                        help="Base URL of mock_ai_server.py; empty to keep the configured providers")
+    parser.add_argument('--concurrency', type=int, default=10, help="Simultaneous clients")
+    parser.add_argument('--requests', type=int, default=100, help="Requests per route and caching mode")
+    parser.add_argument('--properties', type=int, default=20, help="Published properties to spread the load over")
+    parser.add_argument('--modes', default='on,off', help="Caching modes to run, among 'on' and 'off'")
+    parser.add_argument('--json', help="Also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    base_url = options.url.rstrip('/')
+    options.mock_url = options.mock_url.rstrip('/')
+    odoo = Odoo(base_url, options.db, options.login, options.password)
+
+    saved = {key: odoo.get_param(key) for key in BENCHMARK_PARAMS}
+    results = {}
+    try:
+        if options.mock_url:
+            odoo.set_param('real_estate.llm_base_url', f'{options.mock_url}/v1')
+            odoo.set_param('real_estate.geocoder_url', f'{options.mock_url}/search')
+            for key in ('groq.api_key', 'groq_api_key2'):
+                if not saved[key]:
+                    odoo.set_param(key, 'mock')
+        targets = get_targets(odoo, base_url, options.properties)
+        for mode in options.modes.split(','):
+            odoo.set_param('real_estate.disable_caches', '1' if mode == 'off' else False)
+            # Let the workers pick up the parameter change
+            time.sleep(1)
+            print(f"Caching {mode}: {options.requests} requests per route, concurrency {options.concurrency}...")
+            results[mode] = run_mode(targets, options)
+    finally:
+        for key, value in saved.items():
+            odoo.set_param(key, value or False)
+
+    print_report(results)
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
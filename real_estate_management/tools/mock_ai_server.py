@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Offline stand-in for the Groq (OpenAI-compatible) and Nominatim APIs.
+
+Lets the AI content, news, city insights and geocoding paths run, and be
+load tested, without network access or provider quotas. Only the standard
+library is needed; run it next to Odoo:
+
+    python3 mock_ai_server.py --port 8099 --latency-ms 800 --jitter-ms 400 --error-rate 0.05
+
+and point the module at it with these system parameters:
+
+    real_estate.llm_base_url = http://127.0.0.1:8099/v1
+    real_estate.geocoder_url = http://127.0.0.1:8099/search
+
+Any non-empty groq.api_key / groq_api_key2 is accepted. GET /stats
+returns the number of requests served per endpoint, /stats/reset clears it.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Geocoded points are spread over this (south, west, north, east) box
+GEOCODE_BBOX = (8.0, 68.0, 32.0, 88.0)
+
+
+def get_mock_answer(messages):
+    """Answer JSON prompts with the keys they ask for, anything else with ticker text"""
+    prompt = messages[-1].get('content', '') if messages else ''
+    if 'JSON' not in prompt:
+        return ("🏙️ Mock Real Estate Update | 📈 Steady 12% Annual Appreciation | "
+                "🚇 Metro Extension Underway | 💼 New IT Park Announced | ⚡ Limited Premium Plots Left")
+    # The prompts list the expected keys as "- key" or "- key: description"
+    keys = re.findall(r'^- (\w+)', prompt, re.MULTILINE)
+    return json.dumps({key: [f"Mock {key.replace('_', ' ')} point {i}" for i in range(1, 4)] for key in keys})
+
+
+def get_mock_usage(messages, answer):
+    prompt_tokens = sum(len(m.get('content', '').split()) for m in messages)
+    completion_tokens = len(answer.split())
+    return {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': prompt_tokens + completion_tokens,
+    }
+
+
+def get_mock_location(address):
+    """Stable coordinates for ``address`` inside GEOCODE_BBOX"""
+    digest = hashlib.sha1(address.strip().lower().encode()).digest()
+    south, west, north, east = GEOCODE_BBOX
+    lat = south + (north - south) * int.from_bytes(digest[:4], 'big') / 2 ** 32
+    lon = west + (east - west) * int.from_bytes(digest[4:8], 'big') / 2 ** 32
+    return round(lat, 6), round(lon, 6)
+
+
+class MockAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockAI/1.0'
+
+    @property
+    def options(self):
+        return self.server.options
+
+    def log_message(self, format, *args):
+        if self.options.verbose:
+            super().log_message(format, *args)
+
+    # ---------------------------------------------------------------- helpers
+    def _count(self, endpoint):
+        with self.server.stats_lock:
+            self.server.stats[endpoint] = self.server.stats.get(endpoint, 0) + 1
+
+    def _simulate_latency(self):
+        delay = self.options.latency_ms + random.uniform(0, self.options.jitter_ms)
+        time.sleep(delay / 1000.0)
+
+    def _should_fail(self):
+        return random.random() < self.options.error_rate
+
+    def _send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self):
+        status = self.options.error_status
+        headers = {'Retry-After': '1'} if status == 429 else None
+        self._send_json(status, {'error': {'message': f'Mock error {status}', 'type': 'mock_error'}}, headers)
+
+    # ---------------------------------------------------------------- routes
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/search':
+            return self._geocode(parse_qs(url.query))
+        if url.path == '/stats':
+            with self.server.stats_lock:
+                return self._send_json(200, dict(self.server.stats))
+        if url.path == '/stats/reset':
+            with self.server.stats_lock:
+                self.server.stats.clear()
+            return self._send_json(200, {})
+        self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip('/').endswith('/chat/completions'):
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            return self._chat_completions(payload)
+        self._send_json(404, {'error': 'not found'})
+
+    def _geocode(self, query):
+        self._count('geocode')
+        self._simulate_latency()
+        if self._should_fail():
+            return self._send_error()
+        address = (query.get('q') or [''])[0]
+        if not address or random.random() < self.options.geocode_miss_rate:
+            return self._send_json(200, [])
+        lat, lon = get_mock_location(address)
+        self._send_json(200, [{'lat': str(lat), 'lon': str(lon), 'display_name': address}])
+
+    def _chat_completions(self, payload):
+        stream = bool(payload.get('stream'))
+        self._count('chat_stream' if stream else 'chat')
+        # Time to first token: the provider thinks before answering
+        self._simulate_latency()
+        if self._should_fail():
+            return self._send_error()
+
+        messages = payload.get('messages') or []
+        model = payload.get('model', 'mock')
+        answer = get_mock_answer(messages)
+        usage = get_mock_usage(messages, answer)
+        if not stream:
+            return self._send_json(200, {
+                'object': 'chat.completion',
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': answer},
+                             'finish_reason': 'stop'}],
+                'usage': usage,
+            })
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        # Without streaming, the whole answer comes as a single chunk
+        fragments = re.findall(r'\S+\s*', answer) if self.options.streaming else [answer]
+        try:
+            for fragment in fragments:
+                chunk = {'object': 'chat.completion.chunk', 'model': model,
+                         'choices': [{'index': 0, 'delta': {'content': fragment}, 'finish_reason': None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(self.options.token_delay_ms / 1000.0)
+            last = {'object': 'chat.completion.chunk', 'model': model, 'choices': [], 'usage': usage}
+            self.wfile.write(f"data: {json.dumps(last)}\n\ndata: [DONE]\n\n".encode())
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency-ms', type=float, default=500,
+                        help="Fixed delay before every answer (time to first token when streaming)")
+    parser.add_argument('--jitter-ms', type=float, default=250, help="Random extra delay, uniform in [0, jitter]")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=503, help="Status code of those errors (429 adds Retry-After)")
+    parser.add_argument('--token-delay-ms', type=float, default=30, help="Delay between two streamed fragments")
+    parser.add_argument('--no-streaming', dest='streaming', action='store_false',
+                        help="Answer streaming requests with a single chunk")
+    parser.add_argument('--geocode-miss-rate', type=float, default=0.0,
+                        help="Share of addresses the geocoder does not find")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    server = ThreadingHTTPServer((options.host, options.port), MockAIHandler)
+    server.daemon_threads = True
+    server.options = options
+    server.stats = {}
+    server.stats_lock = threading.Lock()
+    print(f"Mock AI server on http://{options.host}:{options.port} "
+          f"(LLM base URL /v1, geocoder /search), latency {options.latency_ms:.0f}+{options.jitter_ms:.0f} ms, "
+          f"error rate {options.error_rate:.0%}, streaming {'on' if options.streaming else 'off'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()